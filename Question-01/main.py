@@ -1,13 +1,111 @@
+import time
+
+_IMPORT_START = time.perf_counter()
+
+import argparse
+import json
+import os
+import re
+import sys
 import nltk
 import string
+from functools import lru_cache
+from multiprocessing import Pool
 from nltk.stem import PorterStemmer, WordNetLemmatizer
 
-nltk.download('punkt_tab', quiet=True)
-nltk.download('punkt', quiet=True)
-nltk.download('wordnet', quiet=True)
-nltk.download('omw-1.4', quiet=True)
+_IMPORT_END = time.perf_counter()
+
+# NLTK data each feature needs. A feature is satisfied when all of its
+# resource paths are present locally.
+RESOURCES = {
+    'tokenize': ('tokenizers/punkt_tab',),
+    'lemmatize': ('corpora/wordnet',),
+}
+DOWNLOAD_NAMES = {
+    'tokenize': ('punkt_tab',),
+    'lemmatize': ('wordnet', 'omw-1.4'),
+}
+
+# Chunk cut points for --stream, most to least preferred.
+PARAGRAPH_BREAK = re.compile(r'\n[^\S\n]*\n\s*')
+LINE_BREAK = re.compile(r'\n\s*')
+# Sentence terminator, optional closing quotes/brackets, then whitespace.
+SENTENCE_BREAK = re.compile(r'[.!?]["\'\)\]”’]*\s+')
+WHITESPACE = re.compile(r'\s+')
+FIELDS = ("token", "stemmed", "lemmatized")
+
+def _is_present(resource):
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        return False
+    return True
+
+def missing_resources(lemmatize=True):
+    """Return the features whose NLTK data is not installed, without touching the downloader."""
+    features = ['tokenize', 'lemmatize'] if lemmatize else ['tokenize']
+    return [feature for feature in features
+            if not all(_is_present(resource) for resource in RESOURCES[feature])]
+
+def ensure_resources(lemmatize=True, download=False):
+    """Check that NLTK data is available locally; only call nltk.download when download=True."""
+    missing = missing_resources(lemmatize)
+    if missing and download:
+        for feature in missing:
+            for name in DOWNLOAD_NAMES[feature]:
+                nltk.download(name, quiet=True)
+        missing = missing_resources(lemmatize)
+    if missing:
+        names = [name for feature in missing for name in DOWNLOAD_NAMES[feature]]
+        raise LookupError(f"Missing NLTK data {names}; rerun with --download or call nltk.download() once")
+
+class Normalizer:
+    """Stem and lemmatize tokens, computing each distinct word type only once.
+
+    Results are kept in a bounded LRU cache keyed by word, so on Zipfian text the
+    cost grows with the vocabulary rather than with the number of tokens.
+    """
+
+    def __init__(self, cache_size=65536, lemmatize=True):
+        self.stemmer = PorterStemmer()
+        self.lemmatize = lemmatize
+        self._lemmatizer = None
+        self._normalize_type = lru_cache(maxsize=cache_size)(self._normalize_uncached)
+
+    @property
+    def lemmatizer(self):
+        # WordNet is only read from disk on the first lemmatize() call.
+        if self._lemmatizer is None:
+            self._lemmatizer = WordNetLemmatizer()
+        return self._lemmatizer
+
+    def _normalize_uncached(self, word):
+        lemma = self.lemmatizer.lemmatize(word) if self.lemmatize else None
+        return self.stemmer.stem(word), lemma
+
+    def normalize(self, tokens):
+        """Return (stemmed, lemmatized) pairs aligned with tokens; lemmas are None when disabled."""
+        table = {word: self._normalize_type(word) for word in dict.fromkeys(tokens)}
+        return [table[word] for word in tokens]
+
+    def cache_info(self):
+        """Hit/miss counters of the type cache (hits are counted once per type per batch)."""
+        return self._normalize_type.cache_info()
+
+def measure_startup(lemmatize=True):
+    """Time the cold-start phases (imports, local data check, first WordNet load) in seconds."""
+    timings = {'imports': _IMPORT_END - _IMPORT_START}
+    start = time.perf_counter()
+    missing = missing_resources(lemmatize)
+    timings['resource_check'] = time.perf_counter() - start
+    if lemmatize and not missing:
+        start = time.perf_counter()
+        WordNetLemmatizer().lemmatize('words')
+        timings['wordnet_load'] = time.perf_counter() - start
+    timings['total'] = time.perf_counter() - _IMPORT_START
+    return timings
 
-def process_text_from_file(filename):
+def process_text_from_file(filename, cache_size=65536, lemmatize=True):
     with open(filename, 'r', encoding='utf-8') as file:
         paragraph = file.read()
     
@@ -15,18 +113,185 @@ def process_text_from_file(filename):
     
     tokens = [word.lower() for word in tokens if word not in string.punctuation]
     
-    stemmer = PorterStemmer()
-    lemmatizer = WordNetLemmatizer()
+    normalizer = Normalizer(cache_size, lemmatize)
+    pairs = normalizer.normalize(tokens)
     
-    stemmed = [stemmer.stem(word) for word in tokens]
-    lemmatized = [lemmatizer.lemmatize(word) for word in tokens]
+    stemmed = [stem for stem, _ in pairs]
+    lemmatized = [lemma for _, lemma in pairs]
     
     output = f"""File: {filename}\n\n
 Original Tokens : {tokens}\n\n
-Stemmed         : {stemmed}\n\n
+Stemmed         : {stemmed}"""
+    if lemmatize:
+        output += f"""\n\n
 Lemmatized      : {lemmatized}"""
     print(output)
     with open("output.txt", "w", encoding='utf-8') as out_file:
         out_file.write(output)
 
-process_text_from_file("./paragraph.txt")
\ No newline at end of file
+def _last_break(buffer, pattern):
+    end = None
+    for match in pattern.finditer(buffer):
+        end = match.end()
+    return end
+
+def iter_sentence_chunks(filename, chunk_size=1 << 20):
+    """Yield the file in pieces of roughly chunk_size characters that end on a break.
+
+    Pieces end at the last blank line, else the last newline, else the last
+    sentence break. If none shows up within four chunks the piece is cut at the
+    last whitespace instead, so memory stays bounded even on text without
+    punctuation. Blank lines are the safest cut for nltk.word_tokenize; at the
+    other cuts the tokens next to the boundary may differ from the normal mode
+    (a piece ending in "Dr." tokenizes it as "Dr" and ".").
+    """
+    buffer = ''
+    with open(filename, 'r', encoding='utf-8') as file:
+        while True:
+            block = file.read(chunk_size)
+            if not block:
+                break
+            buffer += block
+            for pattern in (PARAGRAPH_BREAK, LINE_BREAK, SENTENCE_BREAK):
+                cut = _last_break(buffer, pattern)
+                if cut is not None:
+                    break
+            else:
+                if len(buffer) < 4 * chunk_size:
+                    continue
+                cut = _last_break(buffer, WHITESPACE) or len(buffer)
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+    if buffer:
+        yield buffer
+
+def iter_normalized_tokens(filename, chunk_size=1 << 20, normalizer=None):
+    """Yield (token, stemmed, lemmatized) rows one token at a time."""
+    normalizer = normalizer or Normalizer()
+    for chunk in iter_sentence_chunks(filename, chunk_size):
+        tokens = [word.lower() for word in nltk.word_tokenize(chunk) if word not in string.punctuation]
+        for word, (stem, lemma) in zip(tokens, normalizer.normalize(tokens)):
+            yield word, stem, lemma
+
+def stream_text_from_file(filename, output="output.tsv", fmt="tsv", chunk_size=1 << 20,
+                          cache_size=65536, lemmatize=True):
+    """Normalize filename token by token, writing one TSV or JSONL row per token."""
+    normalizer = Normalizer(cache_size, lemmatize)
+    fields = FIELDS if lemmatize else FIELDS[:2]
+    count = 0
+    with open(output, "w", encoding='utf-8', newline='') as out_file:
+        if fmt == "tsv":
+            out_file.write("\t".join(fields) + "\n")
+        for row in iter_normalized_tokens(filename, chunk_size, normalizer):
+            row = row[:len(fields)]
+            if fmt == "tsv":
+                out_file.write("\t".join(row) + "\n")
+            else:
+                out_file.write(json.dumps(dict(zip(fields, row)), ensure_ascii=False) + "\n")
+            count += 1
+    info = normalizer.cache_info()
+    print(f"File: {filename}\nWrote {count} rows to {output}")
+    print(f"Type cache: {info.hits} hits, {info.misses} misses, {info.currsize}/{info.maxsize} entries")
+    return count
+
+_worker_normalizer = None
+
+def _init_worker(cache_size, lemmatize=True):
+    # Runs once per pool process so each worker builds its own stemmer/lemmatizer.
+    global _worker_normalizer
+    _worker_normalizer = Normalizer(cache_size, lemmatize)
+
+def normalize_document(text, normalizer):
+    """Return (tokens, stemmed, lemmatized) lists for a single document."""
+    tokens = [word.lower() for word in nltk.word_tokenize(text) if word not in string.punctuation]
+    pairs = normalizer.normalize(tokens)
+    return tokens, [stem for stem, _ in pairs], [lemma for _, lemma in pairs]
+
+def _normalize_job(job):
+    doc_id, text = job
+    return doc_id, normalize_document(text, _worker_normalizer)
+
+def iter_documents(path):
+    """Yield (doc_id, text): one document per file of a directory, or per non-empty line of a file."""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            full_path = os.path.join(path, name)
+            if os.path.isfile(full_path):
+                with open(full_path, 'r', encoding='utf-8') as file:
+                    yield name, file.read()
+    else:
+        with open(path, 'r', encoding='utf-8') as file:
+            for line_number, line in enumerate(file, 1):
+                if line.strip():
+                    yield line_number, line
+
+def process_documents(path, output="output.jsonl", workers=os.cpu_count(), chunksize=16, cache_size=65536,
+                      lemmatize=True):
+    """Normalize every document under path on a process pool, writing JSONL in input order."""
+    count = 0
+    start = time.perf_counter()
+    with open(output, "w", encoding='utf-8') as out_file:
+        if workers > 1:
+            pool = Pool(workers, initializer=_init_worker, initargs=(cache_size, lemmatize))
+            results = pool.imap(_normalize_job, iter_documents(path), chunksize)
+        else:
+            pool = None
+            _init_worker(cache_size, lemmatize)
+            results = map(_normalize_job, iter_documents(path))
+        try:
+            for doc_id, (tokens, stemmed, lemmatized) in results:
+                row = {"doc": doc_id, "tokens": tokens, "stemmed": stemmed}
+                if lemmatize:
+                    row["lemmatized"] = lemmatized
+                out_file.write(json.dumps(row, ensure_ascii=False) + "\n")
+                count += 1
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"Processed {count} documents in {elapsed:.2f}s ({rate:.1f} docs/sec, {workers} workers) -> {output}")
+    return count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tokenization, stemming and lemmatization")
+    parser.add_argument("filename", nargs="?", default="./paragraph.txt")
+    parser.add_argument("--stream", action="store_true",
+                        help="process the file in sentence-aligned chunks and write one row per token")
+    parser.add_argument("--format", choices=["tsv", "jsonl"], default="tsv")
+    parser.add_argument("--output", help="output path for --stream (default: output.tsv / output.jsonl)")
+    parser.add_argument("--chunk-size", type=int, default=1 << 20, help="characters read per chunk")
+    parser.add_argument("--cache-size", type=int, default=65536,
+                        help="maximum number of word types kept in the stem/lemma cache")
+    parser.add_argument("--workers", type=int,
+                        help="treat the input as a directory or line-delimited file of documents "
+                             "and normalize them on N processes")
+    parser.add_argument("--batch", type=int, default=16, help="documents sent to a worker per task")
+    parser.add_argument("--no-lemmatize", dest="lemmatize", action="store_false",
+                        help="skip lemmatization so WordNet is never loaded")
+    parser.add_argument("--download", action="store_true",
+                        help="fetch missing NLTK data instead of failing (needs network access)")
+    parser.add_argument("--startup-budget", type=float, metavar="SECONDS",
+                        help="print cold-start timings and exit with an error if they exceed SECONDS")
+    args = parser.parse_args()
+
+    try:
+        ensure_resources(args.lemmatize, args.download)
+    except LookupError as e:
+        sys.exit(f"Error: {e}")
+
+    if args.startup_budget is not None:
+        timings = measure_startup(args.lemmatize)
+        print("Startup: " + ", ".join(f"{phase} {seconds * 1000:.1f} ms" for phase, seconds in timings.items()))
+        if timings['total'] > args.startup_budget:
+            sys.exit(f"Error: startup took {timings['total']:.3f}s, budget is {args.startup_budget:.3f}s")
+
+    if args.workers:
+        process_documents(args.filename, args.output or "output.jsonl", args.workers,
+                          args.batch, args.cache_size, args.lemmatize)
+    elif args.stream:
+        stream_text_from_file(args.filename, args.output or f"output.{args.format}",
+                              args.format, args.chunk_size, args.cache_size, args.lemmatize)
+    else:
+        process_text_from_file(args.filename, args.cache_size, args.lemmatize)
@@ -0,0 +1,225 @@
+"""
+Benchmark of the Question 2 extractors under different matching engines
+
+Every extractor (digits, numbers, 10-digit phones, formatted phones and the
+prefixed phone pattern from main.min.py) is timed on synthetic text of a given
+size and phone-number density under:
+
+1. re       - the standard library engine used by main.py
+2. regex    - the third-party regex module (skipped if it is not installed)
+3. scanner  - hand-written character loops, no regular expressions at all
+
+Each result is compared with the re output.
+
+Usage:
+    python benchmark.py [--sizes 100000 1000000] [--densities 0.01 0.1] [--repeat 3]
+"""
+
+import argparse
+import random
+import re
+import time
+import tracemalloc
+
+try:
+    import regex
+except ImportError:  # optional engine
+    regex = None
+
+PATTERNS = {
+    'digits': r'\d',
+    'numbers': r'\d+',
+    'phones': r'\b\d{10}\b',
+    'formatted_phones': r'(?:\(\d{3}\)\s?|\d{3}[-.\s]?)?\d{3}[-.\s]?\d{4}',
+    'prefixed_phones': r'(?:\+91[-\s]?|0)?(\d{10})\b',
+}
+
+WORDS = ("call", "office", "room", "suite", "the", "number", "is", "and", "contact", "code",
+         "zip", "street", "main", "emergency", "format", "digits", "mixed", "content")
+
+def generate_text(size, density, seed=0):
+    """
+    Build deterministic synthetic text with a controlled share of phone numbers
+
+    Args:
+        size (int): Approximate length in characters
+        density (float): Fraction of generated items that are phone numbers;
+                         the rest are words plus an occasional short number
+        seed (int): Random seed
+
+    Returns:
+        str: Synthetic text
+    """
+    rng = random.Random(seed)
+    parts, length = [], 0
+    while length < size:
+        if rng.random() < density:
+            digits = ''.join(rng.choice('0123456789') for _ in range(10))
+            style = rng.randrange(5)
+            if style == 0:
+                item = digits
+            elif style == 1:
+                item = f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+            elif style == 2:
+                item = f"{digits[:3]}-{digits[3:6]}-{digits[6:]}"
+            elif style == 3:
+                item = f"{digits[:3]}.{digits[3:6]}.{digits[6:]}"
+            else:
+                item = f"+91 {digits}"
+        elif rng.random() < 0.05:
+            item = str(rng.randrange(10000))
+        else:
+            item = rng.choice(WORDS)
+        item += rng.choice("  \n,.")
+        parts.append(item)
+        length += len(item)
+    return ''.join(parts)
+
+def _is_word(char):
+    return char.isalnum() or char == '_'
+
+def scan_digits(text):
+    return [char for char in text if char.isdecimal()]
+
+def _digit_runs(text):
+    start = None
+    for i, char in enumerate(text):
+        if char.isdecimal():
+            if start is None:
+                start = i
+        elif start is not None:
+            yield start, i
+            start = None
+    if start is not None:
+        yield start, len(text)
+
+def scan_numbers(text):
+    return [text[start:end] for start, end in _digit_runs(text)]
+
+def scan_phones(text):
+    return [text[start:end] for start, end in _digit_runs(text)
+            if end - start == 10
+            and not (start and _is_word(text[start - 1]))
+            and not (end < len(text) and _is_word(text[end]))]
+
+def _digits_at(text, i, count):
+    end = i + count
+    return end <= len(text) and all(char.isdecimal() for char in text[i:end])
+
+def _is_separator(text, i):
+    return i < len(text) and (text[i] in '-.' or text[i].isspace())
+
+def _match_tail(text, i):
+    # \d{3}[-.\s]?\d{4}, trying the separator before skipping it like the regex engine
+    if not _digits_at(text, i, 3):
+        return -1
+    i += 3
+    if _is_separator(text, i) and _digits_at(text, i + 1, 4):
+        return i + 5
+    return i + 4 if _digits_at(text, i, 4) else -1
+
+def _match_formatted(text, i):
+    # (?:\(\d{3}\)\s?|\d{3}[-.\s]?)? followed by the tail, in the regex's backtracking order
+    prefixes = []
+    if text[i] == '(' and _digits_at(text, i + 1, 3) and i + 4 < len(text) and text[i + 4] == ')':
+        if i + 5 < len(text) and text[i + 5].isspace():
+            prefixes.append(i + 6)
+        prefixes.append(i + 5)
+    elif _digits_at(text, i, 3):
+        if _is_separator(text, i + 3):
+            prefixes.append(i + 4)
+        prefixes.append(i + 3)
+    prefixes.append(i)
+    for start in prefixes:
+        end = _match_tail(text, start)
+        if end != -1:
+            return end
+    return -1
+
+def scan_formatted_phones(text):
+    found, i = [], 0
+    while i < len(text):
+        if text[i] == '(' or text[i].isdecimal():
+            end = _match_formatted(text, i)
+            if end != -1:
+                found.append(text[i:end])
+                i = end
+                continue
+        i += 1
+    return found
+
+def scan_prefixed_phones(text):
+    # (?:\+91[-\s]?|0)?(\d{10})\b only returns the captured digits, and \b after them
+    # means they must be the last 10 digits of a digit run; the prefix never matters
+    return [text[end - 10:end] for start, end in _digit_runs(text)
+            if end - start >= 10 and not (end < len(text) and _is_word(text[end]))]
+
+def build_engines():
+    """
+    Return {engine name: {extractor name: callable(text) -> list}}
+    """
+    engines = {}
+    compiled = {name: re.compile(pattern) for name, pattern in PATTERNS.items()}
+    engines['re'] = {name: pattern.findall for name, pattern in compiled.items()}
+    if regex is not None:
+        compiled = {name: regex.compile(pattern) for name, pattern in PATTERNS.items()}
+        engines['regex'] = {name: pattern.findall for name, pattern in compiled.items()}
+    engines['scanner'] = {
+        'digits': scan_digits,
+        'numbers': scan_numbers,
+        'phones': scan_phones,
+        'formatted_phones': scan_formatted_phones,
+        'prefixed_phones': scan_prefixed_phones,
+    }
+    return engines
+
+def measure(extractor, text, repeat):
+    """
+    Returns:
+        tuple: (result, best wall time in seconds, peak traced memory in bytes)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extractor(text)
+        best = min(best, time.perf_counter() - start)
+        del result
+    tracemalloc.start()
+    result = extractor(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+def run(sizes, densities, repeat=3, seed=0):
+    engines = build_engines()
+    print(f"{'size':>9} {'density':>7} {'extractor':<17} {'engine':<8} "
+          f"{'time (ms)':>10} {'MB/s':>8} {'peak KB':>9} {'matches':>8}  check")
+    for size in sizes:
+        for density in densities:
+            text = generate_text(size, density, seed)
+            megabytes = len(text.encode('utf-8')) / 1e6
+            for extractor in PATTERNS:
+                reference = None
+                for engine, extractors in engines.items():
+                    result, seconds, peak = measure(extractors[extractor], text, repeat)
+                    if reference is None:
+                        reference = result
+                    check = 'ok' if result == reference else 'MISMATCH'
+                    print(f"{size:>9} {density:>7.3f} {extractor:<17} {engine:<8} {seconds * 1000:>10.2f} "
+                          f"{megabytes / seconds:>8.1f} {peak / 1024:>9.0f} {len(result):>8}  {check}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Question 2 extractors")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000],
+                        help="synthetic text sizes in characters")
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.01, 0.1],
+                        help="fraction of generated items that are phone numbers")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if regex is None:
+        print("regex module not installed; benchmarking re and scanner only")
+    run(args.sizes, args.densities, args.repeat, args.seed)
+
+if __name__ == "__main__":
+    main()
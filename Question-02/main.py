@@ -4,12 +4,38 @@ Question 2: Extract digits and phone numbers from a string using regular express
 This program demonstrates:
 1. Extracting all digits from a string
 2. Extracting 10-digit phone numbers from a string
+3. Doing all of the above (plus a digit histogram) in a single scan with scan_text
+4. Streaming matches with byte offsets out of memory-mapped files (--mmap)
+5. Aggregating unique phone numbers over whole directories on a process pool (--workers)
 
 Input: Text from a file
 Output: Lists of extracted digits and phone numbers
+
+Usage:
+    python main.py [input_file] [--mmap] [--output matches.tsv]
+    python main.py [input_file_or_directory] --workers N [--shard-size BYTES]
 """
 
+import argparse
+import mmap
+import os
 import re
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+NUMBER_PATTERN = re.compile(r'\d+')
+FORMATTED_PHONE_PATTERN = re.compile(r'(?:\(\d{3}\)\s?|\d{3}[-.\s]?)?\d{3}[-.\s]?\d{4}')
+WORD_CHAR_PATTERN = re.compile(r'\w')
+MAX_FORMATTED_PHONE_LENGTH = len('(555) 123-4567')
+
+# Bytes versions of the extractors for memory-mapped input. Note that bytes
+# patterns use ASCII semantics for \d, \w and \s.
+BYTES_PATTERNS = {
+    'number': re.compile(rb'\d+'),
+    'phone': re.compile(rb'\b\d{10}\b'),
+    'formatted_phone': re.compile(rb'(?:\(\d{3}\)\s?|\d{3}[-.\s]?)?\d{3}[-.\s]?\d{4}'),
+}
 
 def extract_digits(text):
     """
@@ -72,10 +98,336 @@ def extract_formatted_phone_numbers(text):
     formatted_phones = re.findall(formatted_phone_pattern, text)
     return formatted_phones
 
-def main():
+def normalize_phone_number(phone):
+    """
+    Convert a phone number in any supported format to a canonical integer
+    
+    '(555) 123-4567', '555-123-4567', '555.123.4567' and '5551234567' all
+    become 5551234567. Works on str or bytes matches.
+    
+    Args:
+        phone (str | bytes): Phone number as matched by one of the extractors
+    
+    Returns:
+        int | None: The 10-digit number, or None if it does not have exactly 10 digits
+    """
+    if isinstance(phone, bytes):
+        phone = phone.decode('ascii')
+    digits = re.sub(r'\D', '', phone)
+    return int(digits) if len(digits) == 10 else None
+
+def extract_normalized_phone_numbers(text):
+    """
+    Extract formatted phone numbers and normalize them to 10-digit integers
+    
+    Args:
+        text (str): Input text
+    
+    Returns:
+        list: Canonical phone numbers; shorter local numbers are skipped
+    """
+    normalized = (normalize_phone_number(phone) for phone in extract_formatted_phone_numbers(text))
+    return [phone for phone in normalized if phone is not None]
+
+def scan_text(text):
+    """
+    Run every extractor above in a single scan of the text
+
+    The text is walked once with a digit-run pattern. Digits, numbers and
+    10-digit phone numbers fall out of each run directly, and the digit
+    histogram is counted from the collected runs rather than from the text.
+    A formatted phone number has to start at a digit or at the '(' right
+    before a run and is at most 14 characters long, so it is looked for with a
+    search bounded to the current run. Results are identical to calling the
+    four extract_* functions separately.
+    
+    Args:
+        text (str): Input text
+    
+    Returns:
+        dict: 'digits', 'numbers', 'phone_numbers' and 'formatted_phones' map to
+              lists of (match, start, end) tuples in text order; 'digit_frequency'
+              is a Counter of individual digits
+    """
+    digits, numbers, phone_numbers, formatted_phones = [], [], [], []
+    resume = 0  # formatted-phone matches may not overlap, so the next one starts here
+    
+    for match in NUMBER_PATTERN.finditer(text):
+        start, end = match.span()
+        number = match.group()
+        numbers.append((number, start, end))
+        digits.extend(zip(number, range(start, end), range(start + 1, end + 1)))
+        
+        # \b\d{10}\b: the whole run is 10 digits and is not glued to a word character
+        if (end - start == 10
+                and not (start and WORD_CHAR_PATTERN.match(text, start - 1))
+                and not WORD_CHAR_PATTERN.match(text, end)):
+            phone_numbers.append((number, start, end))
+        
+        pos = max(start - 1, resume)
+        while pos < end:
+            phone = FORMATTED_PHONE_PATTERN.search(text, pos, end + MAX_FORMATTED_PHONE_LENGTH)
+            if not phone or phone.start() >= end:
+                break
+            formatted_phones.append((phone.group(), phone.start(), phone.end()))
+            pos = resume = phone.end()
+    
+    digit_frequency = Counter(''.join(number for number, _, _ in numbers))
+    
+    return {
+        'digits': digits,
+        'numbers': numbers,
+        'phone_numbers': phone_numbers,
+        'formatted_phones': formatted_phones,
+        'digit_frequency': digit_frequency,
+    }
+
+def iter_buffer_matches(buffer, pattern, start=0, end=None, window=1 << 22, overlap=64):
+    """
+    Yield matches of a bytes pattern over buffer[start:end], one window at a time
+    
+    Each window is scanned with pattern.finditer(buffer, pos, endpos), so nothing
+    is copied out of the buffer. Only matches starting before the last `overlap`
+    bytes of a window are trusted; scanning resumes from there (or from the end of
+    the last match) so matches straddling a window edge are found whole. A match
+    that runs into the window edge (e.g. a long digit run) is rescanned with a
+    larger window. `overlap` must be longer than any match of a bounded pattern.
+    
+    Args:
+        buffer: bytes-like object such as an mmap
+        pattern (re.Pattern): compiled bytes pattern
+        start (int): first byte offset to scan
+        end (int): byte offset to stop at (defaults to len(buffer))
+        window (int): bytes scanned per finditer call
+        overlap (int): bytes at the end of each window that are rescanned
+    
+    Yields:
+        re.Match: matches in offset order, identical to pattern.finditer(buffer, start, end)
+    """
+    if window <= 2 * overlap:
+        raise ValueError("window must be more than twice the overlap")
+    end = len(buffer) if end is None else end
+    pos = start
+    size = window
+    while pos < end:
+        endpos = min(end, pos + size)
+        limit = end if endpos == end else endpos - overlap
+        resume = max(pos, limit)
+        size = window
+        for match in pattern.finditer(buffer, pos, endpos):
+            if match.start() >= limit:
+                break
+            if match.end() == endpos and endpos < end:
+                # The match may continue past this window; rescan from its start
+                if match.start() == pos:
+                    size = 2 * (endpos - pos)
+                resume = match.start()
+                break
+            yield match
+            resume = max(limit, match.end())
+        pos = resume
+
+def iter_file_matches(filename, kind, window=1 << 22):
+    """
+    Memory-map a file and yield (start, end, match) for one kind of extractor
+    
+    Args:
+        filename (str): Input file
+        kind (str): 'number', 'phone' or 'formatted_phone'
+        window (int): bytes scanned per finditer call
+    
+    Yields:
+        tuple: (start byte offset, end byte offset, matched text)
+    """
+    pattern = BYTES_PATTERNS[kind]
+    with open(filename, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            for match in iter_buffer_matches(buffer, pattern, window=window):
+                yield match.start(), match.end(), match.group().decode('ascii')
+
+def count_digits(buffer, start=0, end=None, window=1 << 22):
+    """
+    Count ASCII digits of buffer[start:end], copying at most one window at a time
+    
+    Returns:
+        list: ten counts, index i holding the count of digit i
+    """
+    end = len(buffer) if end is None else end
+    counts = [0] * 10
+    for pos in range(start, end, window):
+        chunk = buffer[pos:min(pos + window, end)]
+        for i, digit in enumerate(b'0123456789'):
+            counts[i] += chunk.count(digit)
+    return counts
+
+def count_digits_in_file(filename, window=1 << 22):
+    """
+    Count ASCII digits of a memory-mapped file
+    
+    Returns:
+        Counter: digit character -> count
+    """
+    with open(filename, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return Counter()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            counts = count_digits(buffer, window=window)
+    return Counter({str(digit): count for digit, count in enumerate(counts) if count})
+
+def stream_extract(filename, output='matches.tsv', kinds=('number', 'phone', 'formatted_phone'),
+                   window=1 << 22):
+    """
+    Write every match of the given kinds to a TSV file as it is found
+    
+    Rows are kind, start byte, end byte and the match; each kind is one
+    sequential pass over the mapped file, so memory stays flat as files grow.
+    
+    Returns:
+        tuple: (Counter of matches per kind, Counter of digit frequencies)
+    """
+    totals = Counter()
+    with open(output, 'w', encoding='utf-8') as out_file:
+        out_file.write("kind\tstart\tend\tmatch\n")
+        for kind in kinds:
+            for start, end, text in iter_file_matches(filename, kind, window):
+                out_file.write(f"{kind}\t{start}\t{end}\t{text}\n")
+                totals[kind] += 1
+    return totals, count_digits_in_file(filename, window)
+
+def iter_shards(path, shard_size=64 << 20):
+    """
+    Split a file, or every file under a directory, into line-aligned byte ranges
+    
+    Shard boundaries are moved forward to just after the next newline, so a
+    match never straddles two shards unless it spans a line break itself.
+    
+    Yields:
+        tuple: (filename, start byte, end byte)
+    """
+    if os.path.isdir(path):
+        filenames = sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+    else:
+        filenames = [path]
+    for filename in filenames:
+        size = os.path.getsize(filename)
+        if size == 0:
+            continue
+        with open(filename, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            start = 0
+            while start < size:
+                newline = buffer.find(b'\n', min(start + shard_size, size) - 1)
+                end = size if newline == -1 else newline + 1
+                yield filename, start, end
+                start = end
+
+def extract_shard(shard):
+    """
+    Pool worker: aggregate phone numbers and digits of one shard
+    
+    Phone numbers are counted as ints, which are much smaller than strings
+    and make deduplication across shards a plain Counter merge.
+    
+    Args:
+        shard (tuple): (filename, start byte, end byte)
+    
+    Returns:
+        dict: 'phones' (Counter of 10-digit numbers as int), 'formatted_phones'
+              (Counter of str), 'digits' (list of ten counts), 'bytes', 'seconds', 'pid'
+    """
+    filename, start, end = shard
+    started = time.perf_counter()
+    with open(filename, 'rb') as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        phones = Counter(int(match.group())
+                         for match in iter_buffer_matches(buffer, BYTES_PATTERNS['phone'], start, end))
+        formatted_phones = Counter(match.group().decode('ascii')
+                                   for match in iter_buffer_matches(buffer, BYTES_PATTERNS['formatted_phone'],
+                                                                    start, end))
+        digits = count_digits(buffer, start, end)
+    return {
+        'phones': phones,
+        'formatted_phones': formatted_phones,
+        'digits': digits,
+        'bytes': end - start,
+        'seconds': time.perf_counter() - started,
+        'pid': os.getpid(),
+    }
+
+def parallel_extract(path, workers=os.cpu_count(), shard_size=64 << 20):
+    """
+    Extract phone numbers from a file or directory on a process pool and merge the results
+    
+    Returns:
+        dict: merged 'phones', 'formatted_phones' and 'digits' plus 'workers', a
+              mapping of worker pid -> (bytes processed, busy seconds), and 'seconds'
+    """
+    phones, formatted_phones, digits = Counter(), Counter(), [0] * 10
+    per_worker = {}
+    started = time.perf_counter()
+    with Pool(workers) as pool:
+        for result in pool.imap_unordered(extract_shard, iter_shards(path, shard_size)):
+            phones.update(result['phones'])
+            formatted_phones.update(result['formatted_phones'])
+            digits = [total + count for total, count in zip(digits, result['digits'])]
+            done, busy = per_worker.get(result['pid'], (0, 0.0))
+            per_worker[result['pid']] = (done + result['bytes'], busy + result['seconds'])
+    return {
+        'phones': phones,
+        'formatted_phones': formatted_phones,
+        'digits': digits,
+        'workers': per_worker,
+        'seconds': time.perf_counter() - started,
+    }
+
+def print_parallel_report(result, top=10):
+    total_bytes = sum(done for done, _ in result['workers'].values())
+    print(f"Unique 10-digit phone numbers: {len(result['phones'])} "
+          f"({sum(result['phones'].values())} occurrences)")
+    for phone, count in result['phones'].most_common(top):
+        print(f"  {phone:010d}: {count} times")
+    print(f"Unique formatted phone numbers: {len(result['formatted_phones'])}")
+    print("Digit frequency:")
+    for digit, count in enumerate(result['digits']):
+        print(f"  Digit '{digit}': {count} times")
+    print("Throughput:")
+    for pid, (done, busy) in sorted(result['workers'].items()):
+        rate = done / busy / 1e6 if busy else 0.0
+        print(f"  worker {pid}: {done / 1e6:.1f} MB in {busy:.2f}s ({rate:.1f} MB/s)")
+    print(f"  total: {total_bytes / 1e6:.1f} MB in {result['seconds']:.2f}s "
+          f"({total_bytes / result['seconds'] / 1e6:.1f} MB/s)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract digits and phone numbers from text")
+    parser.add_argument("input", nargs="?", default="input.txt")
+    parser.add_argument("--mmap", action="store_true",
+                        help="memory-map the input and stream matches with byte offsets to --output")
+    parser.add_argument("--output", default="matches.tsv")
+    parser.add_argument("--window", type=int, default=1 << 22, help="bytes scanned per step in --mmap mode")
+    parser.add_argument("--workers", type=int,
+                        help="extract from a file or directory on N processes and print aggregated counts")
+    parser.add_argument("--shard-size", type=int, default=64 << 20, help="approximate bytes per --workers task")
+    args = parser.parse_args(argv)
+    
+    if args.workers:
+        print_parallel_report(parallel_extract(args.input, args.workers, args.shard_size))
+        return
+    
+    if args.mmap:
+        totals, digit_count = stream_extract(args.input, args.output, window=args.window)
+        print(f"Matches written to {args.output}:")
+        for kind in BYTES_PATTERNS:
+            print(f"  {kind}: {totals[kind]}")
+        print(f"Total individual digits: {sum(digit_count.values())}")
+        for digit, count in sorted(digit_count.items()):
+            print(f"  Digit '{digit}': {count} times")
+        return
+    
     # Read input from file
     try:
-        with open('input.txt', 'r', encoding='utf-8') as file:
+        with open(args.input, 'r', encoding='utf-8') as file:
             text = file.read()
         
         print("Original Text:")
@@ -83,17 +435,20 @@ def main():
         print(text)
         print("\n" + "=" * 50)
         
+        # One pass over the text feeds every section below
+        scan = scan_text(text)
+        
         # Part 1: Extract digits
         print("\n1. DIGIT EXTRACTION:")
         print("-" * 30)
         
         # Extract individual digits
-        individual_digits = extract_digits(text)
+        individual_digits = [digit for digit, _, _ in scan['digits']]
         print(f"Individual digits found: {individual_digits}")
         print(f"Total individual digits: {len(individual_digits)}")
         
         # Extract number sequences
-        number_sequences = extract_all_numbers(text)
+        number_sequences = [number for number, _, _ in scan['numbers']]
         print(f"Number sequences found: {number_sequences}")
         print(f"Total number sequences: {len(number_sequences)}")
         
@@ -102,12 +457,12 @@ def main():
         print("-" * 35)
         
         # Extract 10-digit phone numbers
-        phone_numbers = extract_phone_numbers(text)
+        phone_numbers = [phone for phone, _, _ in scan['phone_numbers']]
         print(f"10-digit phone numbers found: {phone_numbers}")
         print(f"Total 10-digit phone numbers: {len(phone_numbers)}")
         
         # Extract formatted phone numbers
-        formatted_phones = extract_formatted_phone_numbers(text)
+        formatted_phones = [phone for phone, _, _ in scan['formatted_phones']]
         print(f"Formatted phone numbers found: {formatted_phones}")
         print(f"Total formatted phone numbers: {len(formatted_phones)}")
         
@@ -116,9 +471,7 @@ def main():
         print("-" * 25)
         
         # Count digits by frequency
-        digit_count = {}
-        for digit in individual_digits:
-            digit_count[digit] = digit_count.get(digit, 0) + 1
+        digit_count = scan['digit_frequency']
         
         print("Digit frequency:")
         for digit, count in sorted(digit_count.items()):
@@ -0,0 +1,195 @@
+"""
+Inverted index from normalized phone numbers to the documents that contain them
+
+Instead of rescanning a corpus with the phone regex for every question of the
+form "which documents contain this number?", the corpus is scanned once and
+every formatted phone number is normalized to its 10-digit integer
+(see main.normalize_phone_number) and recorded with its document id and byte
+offset. The index is written as flat arrays and memory-mapped for lookups:
+
+    header           magic, number of keys, postings and documents
+    keys             sorted uint64 phone numbers
+    starts           uint64, postings of keys[i] are starts[i]:starts[i + 1]
+    posting offsets  uint64 byte offset of each occurrence inside its document
+    name offsets     uint64, name of document d is names[name_offsets[d]:name_offsets[d + 1]]
+    posting docs     uint32 document id of each occurrence
+    names            UTF-8 document names
+
+A lookup is a binary search over the mapped keys (about 20 probes for a million
+numbers) plus slicing of the posting arrays, with no load step.
+
+Usage:
+    python phone_index.py build <file_or_directory> [--index phones.idx]
+    python phone_index.py lookup "(555) 123-4567" [--index phones.idx]
+"""
+
+import argparse
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+
+from main import BYTES_PATTERNS, iter_buffer_matches, normalize_phone_number
+
+MAGIC = b'PHIDX1\0\0'
+HEADER = struct.Struct('<8sQQQ')
+
+def iter_documents(path):
+    """
+    Yield (name, data) for each document: every file of a directory, or every line of a file
+    
+    Args:
+        path (str): Directory or line-delimited file
+    
+    Yields:
+        tuple: (document name, bytes-like document content)
+    """
+    if os.path.isdir(path):
+        for root, _, names in sorted(os.walk(path)):
+            for name in sorted(names):
+                filename = os.path.join(root, name)
+                if os.path.getsize(filename) == 0:
+                    continue
+                with open(filename, 'rb') as file, \
+                        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    yield filename, buffer
+    else:
+        with open(path, 'rb') as file:
+            for line_number, line in enumerate(file, 1):
+                yield f"{path}:{line_number}", line
+
+def build_index(path, index_path='phones.idx'):
+    """
+    Scan every document once and write the phone number index
+    
+    Postings are collected in one array per number (document ids and offsets
+    interleaved) rather than lists of tuples, which keeps the build compact.
+    
+    Args:
+        path (str): Directory or line-delimited file to index
+        index_path (str): Output index file
+    
+    Returns:
+        tuple: (number of distinct phone numbers, number of occurrences, number of documents)
+    """
+    postings = {}
+    names = []
+    pattern = BYTES_PATTERNS['formatted_phone']
+    for doc_id, (name, data) in enumerate(iter_documents(path)):
+        names.append(name)
+        for match in iter_buffer_matches(data, pattern):
+            phone = normalize_phone_number(match.group())
+            if phone is None:
+                continue
+            entries = postings.get(phone)
+            if entries is None:
+                entries = postings[phone] = array('Q')
+            entries.append(doc_id)
+            entries.append(match.start())
+    
+    keys = array('Q', sorted(postings))
+    starts = array('Q', [0])
+    posting_offsets = array('Q')
+    posting_docs = array('I')
+    for phone in keys:
+        entries = postings[phone]
+        posting_docs.fromlist(entries[0::2].tolist())
+        posting_offsets.extend(entries[1::2])
+        starts.append(len(posting_docs))
+    
+    encoded = [name.encode('utf-8') for name in names]
+    name_offsets = array('Q', [0])
+    for name in encoded:
+        name_offsets.append(name_offsets[-1] + len(name))
+    
+    with open(index_path, 'wb') as out_file:
+        out_file.write(HEADER.pack(MAGIC, len(keys), len(posting_docs), len(names)))
+        for section in (keys, starts, posting_offsets, name_offsets, posting_docs):
+            section.tofile(out_file)
+        out_file.write(b''.join(encoded))
+    return len(keys), len(posting_docs), len(names)
+
+class PhoneIndex:
+    """Read-only, memory-mapped view of an index written by build_index."""
+    
+    def __init__(self, index_path='phones.idx'):
+        with open(index_path, 'rb') as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n_keys, n_postings, n_docs = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{index_path} is not a phone index")
+        view = memoryview(self._buffer)
+        pos = HEADER.size
+        sections = []
+        for typecode, count in (('Q', n_keys), ('Q', n_keys + 1), ('Q', n_postings),
+                                ('Q', n_docs + 1), ('I', n_postings)):
+            size = count * array(typecode).itemsize
+            sections.append(view[pos:pos + size].cast(typecode))
+            pos += size
+        self.keys, self.starts, self.posting_offsets, self.name_offsets, self.posting_docs = sections
+        self._names = view[pos:]
+    
+    def __len__(self):
+        return len(self.keys)
+    
+    def document_name(self, doc_id):
+        return bytes(self._names[self.name_offsets[doc_id]:self.name_offsets[doc_id + 1]]).decode('utf-8')
+    
+    def lookup(self, phone):
+        """
+        Find every occurrence of a phone number
+        
+        Args:
+            phone (str | int): Phone number in any supported format, or its canonical integer
+        
+        Returns:
+            list: (document name, byte offset) pairs in document order
+        """
+        if not isinstance(phone, int):
+            phone = normalize_phone_number(phone)
+            if phone is None:
+                return []
+        i = bisect_left(self.keys, phone)
+        if i == len(self.keys) or self.keys[i] != phone:
+            return []
+        start, end = self.starts[i], self.starts[i + 1]
+        return [(self.document_name(doc_id), offset)
+                for doc_id, offset in zip(self.posting_docs[start:end], self.posting_offsets[start:end])]
+    
+    def close(self):
+        for section in (self.keys, self.starts, self.posting_offsets, self.name_offsets,
+                        self.posting_docs, self._names):
+            section.release()
+        self._buffer.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query a phone number -> document index")
+    parser.add_argument("--index", default="phones.idx")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="index a directory (one document per file) or a file (one per line)")
+    build.add_argument("input")
+    lookup = commands.add_parser("lookup", help="list documents containing the given phone numbers")
+    lookup.add_argument("phones", nargs="+")
+    args = parser.parse_args(argv)
+    
+    if args.command == "build":
+        n_keys, n_postings, n_docs = build_index(args.input, args.index)
+        print(f"Indexed {n_postings} occurrences of {n_keys} phone numbers in {n_docs} documents -> {args.index}")
+        return
+    
+    with PhoneIndex(args.index) as index:
+        for phone in args.phones:
+            hits = index.lookup(phone)
+            print(f"{phone}: {len(hits)} occurrence(s)")
+            for name, offset in hits:
+                print(f"  {name} @ byte {offset}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Differential check and benchmark of main.MemoTokenizer and the experimental DFA tokenizer.
+
+The check compares every engine with main.tokenize on input.txt and on random
+strings drawn from the characters the rules care about (letters n/t/s/d/m/l/r/e/v,
+apostrophes, hyphens, digits, \\w and non-\\w Unicode), in the ASCII and the
+Unicode mode, and exits non-zero on the first mismatch; test_matches_regex runs
+the same check under pytest. The benchmark then times, on synthetic Zipfian text:
+
+1. regex       - main.tokenize (TOKEN_PATTERN.findall)
+2. regex+memo  - main.MemoTokenizer, each distinct word tokenized once
+3. regex warm  - the same MemoTokenizer reused across runs, as when one
+                 instance tokenizes many chunks or documents
+4. table       - dfa_tokenizer.tokenize, every word scanned
+5. table+memo  - dfa_tokenizer.TableTokenizer, each distinct word scanned once
+6. table warm  - the same TableTokenizer reused across runs
+
+The table engine loses to the regex in every row (one Python-level table
+lookup per character against re's C loop); the memo is where the speedup is.
+
+Usage:
+	python benchmark.py [--sizes 100000 1000000] [--cases 200000] [--repeat 3]
+	python -m pytest benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import dfa_tokenizer
+from main import MemoTokenizer, tokenize
+
+FUZZ_ALPHABET = "aAbBnNtTsSdDmMlLrReEvV'-_ .,!?1290\n\té’ÉΣ٣²"
+WORDS = (
+	"the", "of", "and", "to", "a", "in", "is", "it", "that", "was", "he", "for", "on", "are", "with",
+	"don't", "can't", "isn't", "I'm", "you're", "they've", "we'll", "she'd", "it's", "John's",
+	"U.S.A.", "NASA", "e-mail", "well-known", "state-of-the-art", "1990s", "3-4", "2024", "42",
+	"tokenizer", "computational", "linguistics", "Kochi", "rock'n'roll", "O'Neil",
+)
+PUNCTUATION = ("", "", "", "", ",", ".", "!", "?", ";", ":", ")", '"')
+
+
+def check_equivalence(texts: Sequence[str]) -> Optional[str]:
+	"""Return the first text on which the engines disagree, or None."""
+	memo = dfa_tokenizer.TableTokenizer()
+	regex_memo = MemoTokenizer()
+	unicode_memo = MemoTokenizer(unicode=True)
+	for text in texts:
+		expected = tokenize(text)
+		spans = [text[start:end] for start, end in memo.iter_spans(text)]
+		if not (dfa_tokenizer.tokenize(text) == memo.tokenize(text) == spans == regex_memo.tokenize(text) == expected):
+			return text
+		if unicode_memo.tokenize(text) != tokenize(text, unicode=True):
+			return text
+	return None
+
+
+def equivalence_cases(count: int, seed: int = 0) -> List[str]:
+	"""input.txt, when present, followed by count fuzz cases."""
+	input_path = Path(__file__).with_name("input.txt")
+	texts = [input_path.read_text(encoding="utf-8")] if input_path.exists() else []
+	return texts + fuzz_cases(count, seed)
+
+
+def test_matches_regex() -> None:
+	mismatch = check_equivalence(equivalence_cases(50_000) + [generate_text(100_000)])
+	assert mismatch is None, f"{mismatch!r}: {tokenize(mismatch)} != {dfa_tokenizer.tokenize(mismatch)}"
+
+
+def fuzz_cases(count: int, seed: int = 0) -> List[str]:
+	rng = random.Random(seed)
+	cases = []
+	for _ in range(count):
+		if rng.random() < 0.5:
+			cases.append("".join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randrange(16))))
+		else:
+			glue = rng.choice(("", " ", "-", "'"))
+			cases.append(glue.join(rng.choice(WORDS) for _ in range(rng.randrange(1, 5))))
+	return cases
+
+
+def generate_text(size: int, seed: int = 0) -> str:
+	"""Synthetic text whose word frequencies follow a Zipf law over WORDS plus a long tail."""
+	rng = random.Random(seed)
+	syllables = ["ka", "lo", "ver", "stin", "ma", "re", "tho", "qui", "den", "ba"]
+	vocabulary = list(WORDS) + ["".join(syllables[int(digit)] for digit in str(index)) for index in range(1, 20000)]
+	weights = [1.0 / rank for rank in range(1, len(vocabulary) + 1)]
+	parts: List[str] = []
+	length = 0
+	while length < size:
+		words = rng.choices(vocabulary, weights, k=1024)
+		chunk = " ".join(word + rng.choice(PUNCTUATION) for word in words) + "\n"
+		parts.append(chunk)
+		length += len(chunk)
+	return "".join(parts)[:size]
+
+
+def best_time(function: Callable[[str], List[str]], text: str, repeat: int) -> float:
+	best = float("inf")
+	for _ in range(repeat):
+		start = time.perf_counter()
+		function(text)
+		best = min(best, time.perf_counter() - start)
+	return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Compare the memoized and table-driven tokenizers with main.tokenize")
+	parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000],
+		help="synthetic text sizes in characters")
+	parser.add_argument("--cases", type=int, default=200_000, help="random strings for the differential check")
+	parser.add_argument("--repeat", type=int, default=3)
+	parser.add_argument("--seed", type=int, default=0)
+	args = parser.parse_args(argv)
+
+	texts = equivalence_cases(args.cases, args.seed)
+	mismatch = check_equivalence(texts)
+	if mismatch is not None:
+		print(f"MISMATCH on {mismatch!r}:\n  regex: {tokenize(mismatch)}\n  table: {dfa_tokenizer.tokenize(mismatch)}")
+		return 1
+	print(f"Differential check: {len(texts)} texts, identical tokens")
+
+	engines: Dict[str, Callable[[str], List[str]]] = {
+		"regex": tokenize,
+		"regex+memo": lambda text: MemoTokenizer().tokenize(text),
+		"regex warm": MemoTokenizer().tokenize,
+		"table": dfa_tokenizer.tokenize,
+		"table+memo": lambda text: dfa_tokenizer.TableTokenizer().tokenize(text),
+		"table warm": dfa_tokenizer.TableTokenizer().tokenize,
+	}
+	print(f"{'size':>9} {'engine':<11} {'time (ms)':>10} {'MB/s':>7} {'speedup':>8}")
+	for size in args.sizes:
+		text = generate_text(size, args.seed)
+		if check_equivalence([text]) is not None:
+			print(f"MISMATCH on the {size}-character synthetic text")
+			return 1
+		megabytes = len(text.encode("utf-8")) / 1e6
+		baseline = None
+		for name, function in engines.items():
+			seconds = best_time(function, text, args.repeat)
+			baseline = baseline or seconds
+			print(f"{size:>9} {name:<11} {seconds * 1000:>10.2f} {megabytes / seconds:>7.1f} {baseline / seconds:>7.2f}x")
+	return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+	raise SystemExit(main())
@@ -0,0 +1,304 @@
+"""Experimental table-driven DFA tokenizer producing the same tokens as main.tokenize.
+
+This is kept as a documented experiment and nothing in main.py uses it: in
+CPython it is slower than main.tokenize in every configuration benchmark.py
+measures (one Python-level table lookup per character against the C loop of
+re). The part that pays off, the per-word memo, is main.MemoTokenizer.
+
+TOKEN_PATTERN tries its nine alternatives in order at every position, and the
+lookaheads of rules 3 and 5 ((?=n't\\b), (?='re\\b) ...) make the engine walk
+each word several times and back off letter by letter. This engine instead:
+
+1. Splits the text on whitespace. No rule matches whitespace and every
+   lookahead stays inside the current word (\\b after it sees whitespace or
+   the end), so each word tokenizes independently of its neighbours.
+2. Maps each character to one of NUM_CLASSES character classes through a
+   lookup table (n, t and the clitic letters get classes of their own).
+3. Runs a DFA over the classes, left to right, one table lookup per character
+   and one for the end of the word. A transition may emit token boundaries at
+   small offsets behind the current character: when "isn't" reaches the end,
+   the boundaries before "n" and after "t" come out together.
+
+The table is compiled once at import by exploring the symbolic step() function
+below from the start state. Wherever a rule has to give up on a lookahead
+("it'sx" is not it + 's), step() replays the characters it was holding from the
+start state, so that work is folded into the table and nothing is ever
+re-scanned at run time.
+
+TableTokenizer adds the same per-word memo as main.MemoTokenizer.
+
+Usage:
+	python dfa_tokenizer.py [optional_path_to_input_file]
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Character classes. END is the virtual character after the last one of a word.
+(OTHER, HYPHEN, APOSTROPHE, DIGIT, WORD, UPPER, LOWER,
+	N, T, R, V, E, L, D, S, M, END) = range(17)
+NUM_CLASSES = 17
+
+LETTERS = frozenset((UPPER, LOWER, N, T, R, V, E, L, D, S, M))
+# Classes that count as \w for the \b checks of rules 3-6.
+WORD_CLASSES = LETTERS | {DIGIT, WORD}
+LETTER_CLASSES = {"n": N, "t": T, "r": R, "v": V, "e": E, "l": L, "d": D, "s": S, "m": M}
+CLITIC_CLASSES = {(D,), (S,), (M,), (R, E), (V, E), (L, L)}  # 'd 's 'm 're 've 'll
+CLITIC_PREFIXES = {prefix[:length] for prefix in CLITIC_CLASSES for length in range(1, len(prefix) + 1)}
+
+ASCII_CLASSES: List[int] = [OTHER] * 128
+for _code in range(128):
+	_char = chr(_code)
+	if "A" <= _char <= "Z":
+		ASCII_CLASSES[_code] = UPPER
+	elif "a" <= _char <= "z":
+		ASCII_CLASSES[_code] = LETTER_CLASSES.get(_char, LOWER)
+	elif "0" <= _char <= "9":
+		ASCII_CLASSES[_code] = DIGIT
+ASCII_CLASSES[ord("-")] = HYPHEN
+ASCII_CLASSES[ord("'")] = APOSTROPHE
+ASCII_CLASSES[ord("_")] = WORD
+
+
+def char_class(char: str) -> int:
+	code = ord(char)
+	if code < 128:
+		return ASCII_CLASSES[code]
+	if char.isdecimal():  # \d is any Unicode decimal digit
+		return DIGIT
+	if char.isalnum():  # other \w characters; rule 9 emits them one at a time
+		return WORD
+	return OTHER
+
+
+class _ClassTable(dict):
+	"""str.translate table from code point to chr(class), filled in on first sight of each character."""
+
+	def __missing__(self, code: int) -> str:
+		self[code] = chr(char_class(chr(code)))
+		return self[code]
+
+
+CLASS_TABLE = _ClassTable((code, chr(cls)) for code, cls in enumerate(ASCII_CLASSES))
+
+
+# Symbolic states, before numbering:
+#   ("start",)                   at a token start
+#   ("upper",)                   one uppercase letter; a second one makes it rule 1
+#   ("abbreviation",)            inside [A-Z]{2,}
+#   ("letters", long, last_n)    inside a letter run (long: 2+ letters, last_n: ends in "n")
+#   ("letters-", )               letter run and a hyphen that may start rule 2
+#   ("hyphenated",)              inside a hyphenated word after its first hyphen
+#   ("hyphenated-",)             hyphenated word and a hyphen that may continue it
+#   ("letters'", long, last_n, seq)  letter run, apostrophe and the clitic letters seq so far
+#   ("'", seq)                   apostrophe at a token start and the clitic letters so far
+#   ("number",), ("number-",)    rule 7, optionally with a pending hyphen
+# A transition emits boundary offsets d: the boundary lies d characters before
+# the position just after the current character.
+State = Tuple
+START: State = ("start",)
+
+
+def _replay(state: State, classes: Sequence[int]) -> Tuple[State, List[int]]:
+	"""Run step() over classes, the last of which is the current character."""
+	cuts: List[int] = []
+	for j, cls in enumerate(classes):
+		state, emitted = step(state, cls)
+		cuts.extend(d + len(classes) - 1 - j for d in emitted)
+	return state, cuts
+
+
+def _then_start(cuts: List[int], cls: int) -> Tuple[State, List[int]]:
+	# Emit cuts, then handle the current character as the first of a new token.
+	state, emitted = step(START, cls)
+	return state, cuts + emitted
+
+
+def _clitic_step(seq: Tuple[int, ...], cls: int, allow_t: bool) -> Tuple[str, Tuple[int, ...]]:
+	"""Classify cls after an apostrophe and clitic letters seq: "more", "done" or "fail"."""
+	if seq == () and cls == T and allow_t:
+		return "more", (T,)
+	if seq == (T,) or seq in CLITIC_CLASSES:
+		return ("done", seq) if cls not in WORD_CLASSES else ("fail", seq)
+	if seq + (cls,) in CLITIC_PREFIXES:
+		return "more", seq + (cls,)
+	return "fail", seq
+
+
+def step(state: State, cls: int) -> Tuple[State, List[int]]:
+	"""One transition of the tokenizer, in terms of the symbolic states above."""
+	kind = state[0]
+	if kind == "start":
+		if cls == END:
+			return START, []
+		if cls == APOSTROPHE:
+			return ("'", ()), []
+		if cls == DIGIT:
+			return ("number",), []
+		if cls == UPPER:
+			return ("upper",), []
+		if cls in LETTERS:
+			return ("letters", False, cls == N), []
+		return START, [0]  # 9. any other single character
+	if kind == "upper":
+		if cls == UPPER:
+			return ("abbreviation",), []  # 1. abbreviation
+		return step(("letters", False, False), cls)
+	if kind == "abbreviation":
+		if cls == UPPER:
+			return state, []
+		return _then_start([1], cls)
+	if kind == "letters":
+		_, long, last_n = state
+		if cls in LETTERS:
+			return ("letters", True, cls == N), []
+		if cls == HYPHEN:
+			return ("letters-",), []
+		if cls == APOSTROPHE:
+			return ("letters'", long, last_n, ()), []
+		return _then_start([1], cls)  # 8. plain word
+	if kind in ("letters-", "hyphenated-"):
+		if cls in LETTERS:
+			return ("hyphenated",), []  # 2. hyphenated word
+		return _then_start([2, 1], cls)  # the word ends before the hyphen, which is rule 9
+	if kind == "hyphenated":
+		if cls in LETTERS:
+			return state, []
+		if cls == HYPHEN:
+			return ("hyphenated-",), []
+		return _then_start([1], cls)
+	if kind == "letters'":
+		_, long, last_n, seq = state
+		outcome, seq = _clitic_step(seq, cls, last_n)
+		if outcome == "more":
+			return ("letters'", long, last_n, seq), []
+		if outcome == "done" and seq == (T,):
+			# 3. base of a negative contraction, then 4. n't; a lone "n" is only rule 4
+			return _then_start([4, 1] if long else [1], cls)
+		if outcome == "done":
+			return _then_start([len(seq) + 2, 1], cls)  # 5. base, then 6. the clitic
+		# 8. the run is a plain word; resume at the apostrophe
+		state, cuts = _replay(START, (APOSTROPHE,) + seq + (cls,))
+		return state, [len(seq) + 2] + cuts
+	if kind == "'":
+		outcome, seq = _clitic_step(state[1], cls, False)
+		if outcome == "more":
+			return ("'", seq), []
+		if outcome == "done":
+			return _then_start([1], cls)  # 6. clitic
+		state, cuts = _replay(START, seq + (cls,))
+		return state, [len(seq) + 1] + cuts  # 9. lone apostrophe
+	if kind == "number":
+		if cls == DIGIT:
+			return state, []
+		if cls == HYPHEN:
+			return ("number-",), []
+		return _then_start([1], cls)  # 7. number
+	if kind == "number-":
+		if cls == DIGIT:
+			return ("number",), []
+		return _then_start([2, 1], cls)
+	raise ValueError(f"unknown state {state!r}")
+
+
+def compile_table() -> List[List[Tuple[int, Tuple[int, ...]]]]:
+	"""Number the states reachable from START and return table[state][cls] = (next state, emitted offsets).
+
+	START is state 0.
+	"""
+	numbers: Dict[State, int] = {START: 0}
+	order = [START]
+	transitions: List[Tuple[State, List[int]]] = []
+	for state in order:  # order grows while it is walked
+		for cls in range(NUM_CLASSES):
+			target, emitted = step(state, cls)
+			if target not in numbers:
+				numbers[target] = len(order)
+				order.append(target)
+			transitions.append((target, emitted))
+	entries = [(numbers[target], tuple(emitted)) for target, emitted in transitions]
+	return [entries[row:row + NUM_CLASSES] for row in range(0, len(entries), NUM_CLASSES)]
+
+
+TABLE = compile_table()
+
+
+def scan_word(word: str) -> List[Tuple[int, int]]:
+	"""Return (start, end) token spans for a string that contains no whitespace."""
+	table = TABLE
+	cuts = [0]
+	row = table[0]
+	# Every class id is below 128, so the translated word encodes to one byte per character.
+	for i, cls in enumerate(word.translate(CLASS_TABLE).encode("ascii")):
+		state, emitted = row[cls]
+		if emitted:
+			cuts.extend(i + 1 - d for d in emitted)
+		row = table[state]
+	n = len(word)
+	cuts.extend(n + 1 - d for d in row[END][1])
+	if cuts[-1] != n:
+		cuts.append(n)
+	return list(zip(cuts, cuts[1:]))
+
+
+class TableTokenizer:
+	"""Tokenizer over scan_word with a per-word memo of the resulting tokens."""
+
+	def __init__(self, cache_size: int = 1 << 16) -> None:
+		self.cache_size = cache_size
+		self._cache: Dict[str, List[str]] = {}
+
+	def tokenize_word(self, word: str) -> List[str]:
+		tokens = self._cache.get(word)
+		if tokens is None:
+			tokens = [word[start:end] for start, end in scan_word(word)]
+			if len(self._cache) < self.cache_size:
+				self._cache[word] = tokens
+		return tokens
+
+	def tokenize(self, text: str) -> List[str]:
+		"""Same result as main.tokenize(text)."""
+		tokens: List[str] = []
+		for word in text.split():
+			tokens.extend(self.tokenize_word(word))
+		return tokens
+
+	def iter_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+		"""Yield (start, end) character offsets of every token in text."""
+		n = len(text)
+		i = 0
+		while i < n:
+			while i < n and text[i].isspace():
+				i += 1
+			j = i
+			while j < n and not text[j].isspace():
+				j += 1
+			if j > i:
+				for start, end in scan_word(text[i:j]):
+					yield i + start, i + end
+			i = j
+
+
+def tokenize(text: str) -> List[str]:
+	"""Tokenize without the per-word memo (every word is scanned)."""
+	tokens: List[str] = []
+	for word in text.split():
+		tokens.extend(word[start:end] for start, end in scan_word(word))
+	return tokens
+
+
+def main(argv: List[str]) -> int:
+	input_path = Path(argv[1]) if len(argv) > 1 else Path(__file__).with_name("input.txt")
+	if not input_path.exists():
+		print(f"Input file not found: {input_path}", file=sys.stderr)
+		return 1
+	text = input_path.read_text(encoding="utf-8", errors="replace")
+	sys.stdout.write("".join(token + "\n" for token in TableTokenizer().tokenize(text)))
+	return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+	raise SystemExit(main(sys.argv))
@@ -6,70 +6,586 @@ Requirements implemented:
 3. Abbreviations comprised of ALL CAPS letters (e.g. USA, NATO) kept as single tokens.
 4. Internal hyphenated words (e.g. ice-cream, twenty-one) kept as single tokens.
 
+The rules only know ASCII letters; with --unicode (unicode=True in the API)
+letters are matched by Unicode category instead, so accented and Indic words
+stay whole. Pure-ASCII chunks still go through the ASCII pattern.
+
 Usage:
-	python main.py [optional_path_to_input_file]
+	python main.py [optional_path_to_input_file] [--offsets]
+	python main.py input.txt --save-columns tokens.bin
+	python main.py docs/ --workers 8 --output tokens.jsonl
+	python main.py malayalam.txt --unicode
 
 If no path is provided it defaults to "input.txt" in the same directory.
+The file is tokenized as a stream, so inputs larger than memory are fine.
+With --workers the input is a directory (one document per file) or a JSONL
+file (one document per line) and documents are tokenized on a process pool.
 """
 
 from __future__ import annotations
 
+import argparse
+import json
+import mmap
+import os
 import re
+import struct
 import sys
+import time
+import unicodedata
+from array import array
+from collections import deque
+from functools import lru_cache
+from multiprocessing import Pool
 from pathlib import Path
-from typing import List, Iterable
+from typing import Any, Callable, Dict, List, Iterable, Iterator, Optional, TextIO, Tuple, Union
 
+try:
+	import regex
+except ImportError:  # optional; Unicode mode then builds its letter classes from unicodedata
+	regex = None
 
-# Precompile a regex that captures tokens according to the required precedence.
+
+# The tokenizer rules in precedence order; a token's rule id is its 1-based position.
 # Order matters: more specific / longer multi-char tokens should appear first.
-TOKEN_PATTERN = re.compile(
-	r"""
-	(?:[A-Z]{2,})                                  # 1. Abbreviations (ALL CAPS, length>=2)
-	| (?:[A-Za-z]+(?:-[A-Za-z]+)+)                 # 2. Hyphenated words (letters-hyphen-letters)
-	| (?:[A-Za-z]+(?=n't\b))                      # 3. Base of negative contractions (is in isn't, ca in can't)
-	| (?:n't\b)                                   # 4. The contracted n't ending
-	| (?:[A-Za-z]+(?='(?:re|ve|ll|d|s|m)\b))      # 5. Base before other common endings ('s, 're, ...)
-	| (?:'(?:re|ve|ll|d|s|m)\b)                   # 6. Contraction endings themselves
-	| (?:\d+(?:-\d+)*)                           # 7. Numbers (optionally hyphenated)
-	| (?:[A-Za-z]+)                                # 8. Plain words
-	| (?:[^\sA-Za-z0-9])                          # 9. Any single non-space, non-alnum char (punct / symbol)
-	""",
-	re.VERBOSE,
+TOKEN_RULES: Tuple[Tuple[str, str], ...] = (
+	("abbreviation", r"[A-Z]{2,}"),                          # 1. Abbreviations (ALL CAPS, length>=2)
+	("hyphenated", r"[A-Za-z]+(?:-[A-Za-z]+)+"),             # 2. Hyphenated words (letters-hyphen-letters)
+	("negation_base", r"[A-Za-z]+(?=n't\b)"),                # 3. Base of negative contractions (is in isn't, ca in can't)
+	("negation", r"n't\b"),                                  # 4. The contracted n't ending
+	("clitic_base", r"[A-Za-z]+(?='(?:re|ve|ll|d|s|m)\b)"),  # 5. Base before other common endings ('s, 're, ...)
+	("clitic", r"'(?:re|ve|ll|d|s|m)\b"),                    # 6. Contraction endings themselves
+	("number", r"\d+(?:-\d+)*"),                             # 7. Numbers (optionally hyphenated)
+	("word", r"[A-Za-z]+"),                                  # 8. Plain words
+	("symbol", r"[^\sA-Za-z0-9]"),                           # 9. Any single non-space, non-alnum char (punct / symbol)
 )
+RULE_NAMES: Tuple[str, ...] = tuple(name for name, _ in TOKEN_RULES)
+
+# Precompile a regex that captures tokens according to the required precedence.
+TOKEN_PATTERN = re.compile("|".join(f"(?:{pattern})" for _, pattern in TOKEN_RULES))
+# Same alternation with one capturing group per rule, so match.lastindex is the rule id.
+RULE_PATTERN = re.compile("|".join(f"({pattern})" for _, pattern in TOKEN_RULES))
+WHITESPACE = re.compile(r"\s")
+
+
+def _category_class(categories: Tuple[str, ...]) -> str:
+	"""Character-class ranges covering every code point whose category starts with one of categories."""
+	ranges = []
+	first = None
+	for code in range(sys.maxunicode + 2):
+		inside = code <= sys.maxunicode and unicodedata.category(chr(code)).startswith(categories)
+		if inside and first is None:
+			first = code
+		elif not inside and first is not None:
+			ranges.append(re.escape(chr(first)) + ("-" + re.escape(chr(code - 1)) if code - 1 > first else ""))
+			first = None
+	return "".join(ranges)
 
 
-def tokenize(text: str) -> List[str]:
+def unicode_rule(pattern: str, letters: str, upper: str) -> str:
+	"""Rewrite an ASCII rule from TOKEN_RULES to match letters by category and ’ as an apostrophe.
+
+	\\b becomes an explicit "no letter or \\w follows" so that combining marks,
+	which re does not count as \\w, end a contraction the same way in both engines.
+	"""
+	return (pattern.replace(r"[^\sA-Za-z0-9]", rf"[^\s{letters}0-9]")
+		.replace("[A-Za-z]", f"[{letters}]")
+		.replace("[A-Z]", f"[{upper}]")
+		.replace("'", "['’]")
+		.replace(r"\b", rf"(?![\w{letters}])"))
+
+
+@lru_cache(maxsize=None)
+def unicode_patterns() -> Tuple[Any, Any]:
+	"""(token pattern, rule pattern) of the Unicode mode, compiled on first use.
+
+	Letters are any letter or combining mark, so Indic vowel signs stay inside
+	their word, and abbreviations are runs of uppercase letters. With the regex
+	module this is \\p{L}\\p{M} and \\p{Lu}; without it the same classes are
+	built from unicodedata, which takes a moment once per process.
+	"""
+	if regex is not None:
+		engine, letters, upper = regex, r"\p{L}\p{M}", r"\p{Lu}"
+	else:
+		engine, letters, upper = re, _category_class(("L", "M")), _category_class(("Lu",))
+	rules = [unicode_rule(pattern, letters, upper) for _, pattern in TOKEN_RULES]
+	return (engine.compile("|".join(f"(?:{pattern})" for pattern in rules)),
+		engine.compile("|".join(f"({pattern})" for pattern in rules)))
+
+
+def select_pattern(text: str, unicode: bool = False, rules: bool = False) -> Any:
+	"""Pattern to run over text: the ASCII one unless unicode is set and text is not pure ASCII.
+
+	On ASCII input the Unicode rules match exactly what the ASCII rules match,
+	so the fast path never changes the result.
+	"""
+	if not unicode or text.isascii():
+		return RULE_PATTERN if rules else TOKEN_PATTERN
+	token_pattern, rule_pattern = unicode_patterns()
+	return rule_pattern if rules else token_pattern
+
+
+def tokenize(text: str, unicode: bool = False) -> List[str]:
 	"""Tokenize input English text per the specified heuristic rules.
 
 	Steps:
 	  1. Use a master regex to extract tokens preserving order.
 	  2. Filter out stray whitespace (regex avoids matching it anyway).
 	"""
-	tokens = TOKEN_PATTERN.findall(text)
+	tokens = select_pattern(text, unicode).findall(text)
 	return [t for t in tokens if t and not t.isspace()]
 
 
+class MemoTokenizer:
+	"""tokenize() with a memo of the tokens of each distinct whitespace-separated word.
+
+	No rule matches whitespace and every lookahead stops at it, so a word gives
+	the same tokens on its own as inside its text. On natural (Zipfian) text most
+	words then cost a dict lookup; reuse one instance across chunks or documents
+	to keep the memo warm.
+	"""
+
+	def __init__(self, cache_size: int = 1 << 16, unicode: bool = False) -> None:
+		self.cache_size = cache_size
+		self.unicode = unicode
+		self._cache: Dict[str, List[str]] = {}
+
+	def tokenize_word(self, word: str) -> List[str]:
+		tokens = self._cache.get(word)
+		if tokens is None:
+			tokens = tokenize(word, self.unicode)
+			if len(self._cache) < self.cache_size:
+				self._cache[word] = tokens
+		return tokens
+
+	def tokenize(self, text: str) -> List[str]:
+		"""Same result as tokenize(text, unicode)."""
+		tokens: List[str] = []
+		for word in text.split():
+			tokens.extend(self.tokenize_word(word))
+		return tokens
+
+
+def _split_point(buffer: str) -> int:
+	"""Index just past the last whitespace character of buffer (0 if there is none)."""
+	i = len(buffer)
+	while i and not buffer[i - 1].isspace():
+		i -= 1
+	return i
+
+
+def _iter_stream_matches(
+	stream: TextIO, chunk_size: int, unicode: bool = False, rules: bool = False
+) -> Iterator[Tuple[re.Match, int]]:
+	"""Yield (match, offset of the piece it was found in) over a stream cut at whitespace.
+
+	The pattern is chosen per piece, so only pieces with non-ASCII text pay for the Unicode rules.
+	"""
+	base = 0
+	buffer = ""
+	while True:
+		chunk = stream.read(chunk_size)
+		buffer += chunk
+		cut = _split_point(buffer) if chunk else len(buffer)
+		piece, buffer = buffer[:cut], buffer[cut:]
+		for match in select_pattern(piece, unicode, rules).finditer(piece):
+			yield match, base
+		base += cut
+		if not chunk:
+			return
+
+
+def iter_tokens(
+	stream: TextIO, with_offsets: bool = False, chunk_size: int = 1 << 16, unicode: bool = False
+) -> Iterator[Union[str, Tuple[str, int, int]]]:
+	"""Lazily tokenize a text stream, yielding the same tokens as tokenize().
+
+	The stream is read chunk_size characters at a time. No token spans
+	whitespace and every rule only looks ahead within the current word, so each
+	piece is cut just after its last whitespace character and the rest is
+	carried into the next read. Memory is bounded by chunk_size plus the longest
+	whitespace-free run.
+
+	With with_offsets=True, yields (token, start, end) character offsets into
+	the whole stream instead of bare strings. With unicode=True letters are
+	matched by category (see unicode_patterns).
+	"""
+	for match, base in _iter_stream_matches(stream, chunk_size, unicode):
+		if with_offsets:
+			yield match.group(), base + match.start(), base + match.end()
+		else:
+			yield match.group()
+
+
+class TokenColumns:
+	"""Compact columnar token stream: offsets plus the id of the rule that matched.
+
+	Tokens are stored as parallel columns (start and end character offsets as
+	unsigned 32-bit ints, one rule-id byte) instead of one str object each, which
+	is roughly 9 bytes per token instead of 50+. The token text is recovered by
+	slicing the original text. Columns can be saved to disk and memory-mapped back.
+
+	File layout: magic, token count (uint64), starts, ends, rule ids.
+	"""
+
+	MAGIC = b"TOKCOL1\0"
+	HEADER = struct.Struct("<8sQ")
+
+	def __init__(self, starts=None, ends=None, rules=None, buffer: Optional[mmap.mmap] = None) -> None:
+		self.starts = starts if starts is not None else array("I")
+		self.ends = ends if ends is not None else array("I")
+		self.rules = rules if rules is not None else array("B")
+		self._buffer = buffer
+
+	@classmethod
+	def from_text(cls, text: str, unicode: bool = False) -> "TokenColumns":
+		columns = cls()
+		columns.extend(select_pattern(text, unicode, rules=True).finditer(text))
+		return columns
+
+	@classmethod
+	def from_stream(cls, stream: TextIO, chunk_size: int = 1 << 16, unicode: bool = False) -> "TokenColumns":
+		columns = cls()
+		for match, base in _iter_stream_matches(stream, chunk_size, unicode, rules=True):
+			columns.starts.append(base + match.start())
+			columns.ends.append(base + match.end())
+			columns.rules.append(match.lastindex)
+		return columns
+
+	def extend(self, matches: Iterable[re.Match], base: int = 0) -> None:
+		for match in matches:
+			self.starts.append(base + match.start())
+			self.ends.append(base + match.end())
+			self.rules.append(match.lastindex)
+
+	def __len__(self) -> int:
+		return len(self.starts)
+
+	def token(self, text: str, i: int) -> str:
+		return text[self.starts[i]:self.ends[i]]
+
+	def tokens(self, text: str) -> List[str]:
+		return [text[start:end] for start, end in zip(self.starts, self.ends)]
+
+	def rule_name(self, i: int) -> str:
+		return RULE_NAMES[self.rules[i] - 1]
+
+	def save(self, path: Path) -> None:
+		with open(path, "wb") as out:
+			out.write(self.HEADER.pack(self.MAGIC, len(self)))
+			for column in (self.starts, self.ends, self.rules):
+				if isinstance(column, array):
+					column.tofile(out)
+				else:
+					out.write(column)
+
+	@classmethod
+	def load(cls, path: Path) -> "TokenColumns":
+		"""Memory-map a saved file; the columns are read-only views, nothing is copied."""
+		with open(path, "rb") as f:
+			buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, count = cls.HEADER.unpack_from(buffer)
+		if magic != cls.MAGIC:
+			buffer.close()
+			raise ValueError(f"{path} is not a token column file")
+		view = memoryview(buffer)
+		offset = cls.HEADER.size
+		starts = view[offset:offset + 4 * count].cast("I")
+		ends = view[offset + 4 * count:offset + 8 * count].cast("I")
+		rules = view[offset + 8 * count:offset + 9 * count]
+		return cls(starts, ends, rules, buffer)
+
+	def close(self) -> None:
+		if self._buffer is not None:
+			for column in (self.starts, self.ends, self.rules):
+				column.release()
+			self._buffer.close()
+			self._buffer = None
+
+
+def tokenize_columnar(text: str, unicode: bool = False) -> TokenColumns:
+	"""Tokenize text into a TokenColumns instead of a list of strings."""
+	return TokenColumns.from_text(text, unicode)
+
+
+class TokenSession:
+	"""Token spans of a document that is edited in place, re-tokenized incrementally.
+
+	An edit only changes the whitespace-delimited words it touches: no token
+	spans whitespace and every lookahead stays inside its word. So edit() widens
+	the edited range to the surrounding whitespace, re-runs TOKEN_PATTERN on that
+	window alone and splices the new spans in.
+
+	Both the text and the spans live in gap buffers positioned at the last edit.
+	The text is a list of blocks of about BLOCK characters, split into the blocks
+	before and after the gap, and an edit rebuilds only the blocks holding the
+	touched words. Spans before the gap store absolute offsets; spans after it
+	store distances from the end of the document, so an insertion or deletion
+	never has to shift them. Moving a gap costs one step per block or token
+	between the previous edit and this one, which for typing is a handful.
+	"""
+
+	BLOCK = 1 << 12
+
+	def __init__(self, text: str = "", unicode: bool = False) -> None:
+		self.unicode = unicode
+		self._left: List[str] = []  # text blocks before the gap, in order
+		self._right: List[str] = []  # text blocks after the gap, nearest the gap last
+		self._left_length = 0
+		self._length = 0
+		self._head_starts = array("q")
+		self._head_ends = array("q")
+		self._tail_starts = array("q")  # length - start, nearest the gap last
+		self._tail_ends = array("q")
+		self.edit(0, 0, text)
+
+	@property
+	def text(self) -> str:
+		return "".join(self._left) + "".join(reversed(self._right))
+
+	def __len__(self) -> int:
+		return len(self._head_starts) + len(self._tail_starts)
+
+	def spans(self) -> List[Tuple[int, int]]:
+		n = self._length
+		tail = [(n - start, n - end) for start, end in zip(reversed(self._tail_starts), reversed(self._tail_ends))]
+		return list(zip(self._head_starts, self._head_ends)) + tail
+
+	def tokens(self) -> List[str]:
+		text = self.text
+		return [text[start:end] for start, end in self.spans()]
+
+	def _move_span_gap(self, offset: int) -> None:
+		"""Move the span gap so that exactly the spans starting before offset are in the head."""
+		n = self._length
+		head_starts, head_ends = self._head_starts, self._head_ends
+		tail_starts, tail_ends = self._tail_starts, self._tail_ends
+		while head_starts and head_starts[-1] >= offset:
+			tail_starts.append(n - head_starts.pop())
+			tail_ends.append(n - head_ends.pop())
+		while tail_starts and n - tail_starts[-1] < offset:
+			head_starts.append(n - tail_starts.pop())
+			head_ends.append(n - tail_ends.pop())
+
+	def _take_piece(self, start: int, end: int) -> Tuple[str, int]:
+		"""Remove the blocks covering text[start:end] plus the words around it; return them joined and their offset."""
+		left, right = self._left, self._right
+		while self._left_length > start:
+			right.append(left.pop())
+			self._left_length -= len(right[-1])
+		while right and self._left_length + len(right[-1]) <= start:
+			left.append(right.pop())
+			self._left_length += len(left[-1])
+		piece_start = self._left_length
+		piece = right.pop() if right else ""
+		if not WHITESPACE.search(piece, 0, start - piece_start):
+			while left:
+				block = left.pop()
+				piece = block + piece
+				piece_start -= len(block)
+				if WHITESPACE.search(block):
+					break
+			self._left_length = piece_start
+		scan = end - piece_start
+		while right and (scan > len(piece) or not WHITESPACE.search(piece, scan)):
+			scan = max(scan, len(piece))
+			piece += right.pop()
+		return piece, piece_start
+
+	def edit(self, offset: int, deleted: int, inserted: str) -> Tuple[int, int, int]:
+		"""Replace text[offset:offset + deleted] with inserted and update the token spans.
+
+		Returns (index, removed, added): the tokens at [index, index + removed)
+		were replaced by the ones now at [index, index + added).
+		"""
+		if not 0 <= offset <= self._length or deleted < 0 or offset + deleted > self._length:
+			raise ValueError(f"edit ({offset}, {deleted}) is outside a document of length {self._length}")
+		piece, piece_start = self._take_piece(offset, offset + deleted)
+		start, end = offset - piece_start, offset + deleted - piece_start
+		while start and not piece[start - 1].isspace():
+			start -= 1
+		while end < len(piece) and not piece[end].isspace():
+			end += 1
+
+		self._move_span_gap(piece_start + start)
+		index = len(self._head_starts)
+		removed = 0
+		while self._tail_starts and self._length - self._tail_starts[-1] < piece_start + end:
+			self._tail_starts.pop()
+			self._tail_ends.pop()
+			removed += 1
+
+		piece = piece[:offset - piece_start] + inserted + piece[offset + deleted - piece_start:]
+		pattern = select_pattern(piece, self.unicode)
+		for match in pattern.finditer(piece, start, end + len(inserted) - deleted):
+			self._head_starts.append(piece_start + match.start())
+			self._head_ends.append(piece_start + match.end())
+		self._left.extend(piece[i:i + self.BLOCK] for i in range(0, len(piece), self.BLOCK))
+		self._left_length += len(piece)
+		self._length += len(inserted) - deleted
+		return index, removed, len(self._head_starts) - index
+
+
+def write_tokens(
+	tokens: Iterable[Union[str, Tuple[str, int, int]]], out: TextIO, batch_size: int = 8192
+) -> int:
+	"""Write one token (or tab-separated token/start/end) per line, batch_size lines per write."""
+	count = 0
+	batch: List[str] = []
+	for token in tokens:
+		batch.append(token if isinstance(token, str) else "\t".join(map(str, token)))
+		if len(batch) >= batch_size:
+			out.write("\n".join(batch) + "\n")
+			count += len(batch)
+			batch.clear()
+	if batch:
+		out.write("\n".join(batch) + "\n")
+		count += len(batch)
+	return count
+
+
 def iter_file_text(path: Path) -> Iterable[str]:
 	"""Yield file contents as a single string; small helper for clarity."""
 	yield path.read_text(encoding="utf-8", errors="replace")
 
 
+Document = Tuple[Any, str]
+
+_worker_tokenize: Callable[[str], List[str]] = tokenize
+
+
+def _init_worker(unicode: bool = False) -> None:
+	# Runs once per pool process, so the word memo stays warm across batches.
+	global _worker_tokenize
+	_worker_tokenize = MemoTokenizer(unicode=unicode).tokenize
+
+
+def _tokenize_batch(batch: List[Document]) -> Tuple[int, str]:
+	# Serialize in the worker so the parent process only concatenates and writes.
+	lines = []
+	count = 0
+	for doc_id, text in batch:
+		tokens = _worker_tokenize(text)
+		count += len(tokens)
+		lines.append(json.dumps({"id": doc_id, "tokens": tokens}, ensure_ascii=False) + "\n")
+	return count, "".join(lines)
+
+
+def iter_documents(path: Path, text_field: str = "text", id_field: str = "id") -> Iterator[Document]:
+	"""Yield (doc_id, text): one document per file of a directory, or per line of a JSONL file.
+
+	A JSONL line is either a JSON string or an object holding the text under
+	text_field and, optionally, an id under id_field (the line number otherwise).
+	"""
+	if path.is_dir():
+		for child in sorted(path.iterdir()):
+			if child.is_file():
+				yield child.name, child.read_text(encoding="utf-8", errors="replace")
+		return
+	with path.open(encoding="utf-8") as stream:
+		for line_number, line in enumerate(stream, 1):
+			if not line.strip():
+				continue
+			record = json.loads(line)
+			if isinstance(record, str):
+				yield line_number, record
+			else:
+				yield record.get(id_field, line_number), record[text_field]
+
+
+def iter_batches(documents: Iterable[Document], batch_size: int) -> Iterator[List[Document]]:
+	batch: List[Document] = []
+	for document in documents:
+		batch.append(document)
+		if len(batch) >= batch_size:
+			yield batch
+			batch = []
+	if batch:
+		yield batch
+
+
+def _write_batch(job: Tuple[int, Any], out: TextIO, documents: int, tokens: int) -> Tuple[int, int]:
+	size, result = job
+	count, lines = result.get()
+	out.write(lines)
+	return documents + size, tokens + count
+
+
+def tokenize_documents(
+	path: Path,
+	output: Path,
+	workers: int = os.cpu_count() or 1,
+	batch_size: int = 256,
+	unicode: bool = False,
+) -> Tuple[int, int]:
+	"""Tokenize every document under path on a process pool, writing JSONL in input order.
+
+	Documents are sent to workers batch_size at a time, so the pickling and queue
+	round trip is paid once per batch rather than once per document. At most
+	4 * workers batches are in flight, which keeps memory bounded on inputs with
+	millions of documents; results are written as the oldest batch completes.
+	Each process tokenizes with its own MemoTokenizer.
+
+	Returns (documents, tokens).
+	"""
+	documents = tokens = 0
+	start = time.perf_counter()
+	batches = iter_batches(iter_documents(path), batch_size)
+	with open(output, "w", encoding="utf-8") as out:
+		if workers > 1:
+			with Pool(workers, initializer=_init_worker, initargs=(unicode,)) as pool:
+				pending: deque = deque()
+				for batch in batches:
+					pending.append((len(batch), pool.apply_async(_tokenize_batch, (batch,))))
+					while len(pending) >= 4 * workers or (pending and pending[0][1].ready()):
+						documents, tokens = _write_batch(pending.popleft(), out, documents, tokens)
+				while pending:
+					documents, tokens = _write_batch(pending.popleft(), out, documents, tokens)
+		else:
+			_init_worker(unicode)
+			for batch in batches:
+				count, lines = _tokenize_batch(batch)
+				out.write(lines)
+				documents, tokens = documents + len(batch), tokens + count
+	elapsed = max(time.perf_counter() - start, 1e-9)
+	print(f"Tokenized {documents} documents ({tokens} tokens) in {elapsed:.2f}s: "
+	      f"{documents / elapsed:.1f} docs/sec, {tokens / elapsed:.0f} tokens/sec, {workers} workers -> {output}")
+	return documents, tokens
+
+
 def main(argv: List[str]) -> int:
-	if len(argv) > 1:
-		input_path = Path(argv[1])
-	else:
-		input_path = Path(__file__).with_name("input.txt")
+	parser = argparse.ArgumentParser(prog=Path(argv[0]).name, description="Rule-based English tokenizer")
+	parser.add_argument("input", nargs="?", type=Path, default=Path(__file__).with_name("input.txt"))
+	parser.add_argument("--offsets", action="store_true", help="also print start/end character offsets")
+	parser.add_argument("--save-columns", type=Path, metavar="PATH",
+	                    help="write offsets and rule ids in the compact column format instead of printing")
+	parser.add_argument("--workers", type=int, metavar="N",
+	                    help="treat the input as a directory or JSONL file of documents and tokenize them on N processes")
+	parser.add_argument("--batch", type=int, default=256, help="documents sent to a worker per task")
+	parser.add_argument("--output", type=Path, default=Path("tokens.jsonl"), help="JSONL output path for --workers")
+	parser.add_argument("--unicode", action="store_true",
+	                    help="match letters by Unicode category so accented and Indic words stay whole")
+	args = parser.parse_args(argv[1:])
+	input_path = args.input
 
 	if not input_path.exists():
 		print(f"Input file not found: {input_path}", file=sys.stderr)
 		return 1
 
-	text = input_path.read_text(encoding="utf-8", errors="replace")
-	tokens = tokenize(text)
+	if args.workers:
+		tokenize_documents(input_path, args.output, args.workers, args.batch, args.unicode)
+		return 0
+
+	if args.save_columns:
+		with input_path.open(encoding="utf-8", errors="replace") as stream:
+			columns = TokenColumns.from_stream(stream, unicode=args.unicode)
+		columns.save(args.save_columns)
+		print(f"Saved {len(columns)} tokens to {args.save_columns}")
+		return 0
 
-	# Print one token per line for easy inspection.
-	for tok in tokens:
-		print(tok)
+	# Print one token per line for easy inspection, written in large batches.
+	with input_path.open(encoding="utf-8", errors="replace") as stream:
+		write_tokens(iter_tokens(stream, with_offsets=args.offsets, unicode=args.unicode), sys.stdout)
 
 	return 0
 
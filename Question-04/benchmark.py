@@ -0,0 +1,140 @@
+"""
+Benchmark of dictionary search structures for the noisy channel corrector
+
+For each vocabulary size every structure is built over the same synthetic
+dictionary and asked for all words within distance k of misspellings made by
+applying 1-2 random edits to dictionary words:
+
+1. brute   - edit_distance against every word of V (run on --brute-queries only)
+2. numpy   - batch_edit_distance against every word of V at once
+3. bktree  - BKTree, metric pruning on edit distance
+4. trie    - Trie, one shared DP row per prefix
+5. delete  - DeleteIndex, symmetric delete lookup (SymSpell)
+
+Each result is compared with brute force. test_matches_edit_distance checks
+myers_distance and batch_edit_distance against edit_distance under pytest, on
+random strings with empty words, patterns over 64 characters and non-BMP text.
+
+Usage:
+    python benchmark.py [--sizes 10000 100000 1000000] [--distances 1 2] [--queries 200]
+    python -m pytest benchmark.py
+"""
+
+import argparse
+import random
+import string
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from main import BKTree, DeleteIndex, Trie, batch_edit_distance, edit_distance, myers_distance
+
+# Few distinct characters so strings share letters; é and the astral 𝔘 𝔫 cover non-ASCII and non-BMP text.
+DISTANCE_ALPHABET = "abcé𝔘𝔫"
+
+
+def generate_vocabulary(size: int, seed: int = 0) -> List[str]:
+    """Distinct random lowercase words with lengths around 8 (2 to 16)."""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        length = min(16, max(2, int(rng.gauss(8, 2.5))))
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+    return sorted(words)
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    for _ in range(rng.choice((1, 1, 2))):
+        i = rng.randrange(len(word) + 1)
+        op = rng.randrange(3)
+        if op == 0:
+            word = word[:i] + rng.choice(string.ascii_lowercase) + word[i:]
+        elif op == 1 and i < len(word):
+            word = word[:i] + word[i + 1:]
+        elif i < len(word):
+            word = word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+    return word
+
+
+def brute_force(vocabulary: List[str]) -> Callable[[str, int], List[str]]:
+    def candidates(s: str, max_distance: int) -> List[str]:
+        found = ((edit_distance(s, w), w) for w in vocabulary if abs(len(w) - len(s)) <= max_distance)
+        return [w for _, w in sorted(pair for pair in found if pair[0] <= max_distance)]
+    return candidates
+
+
+def batched(vocabulary: List[str]) -> Callable[[str, int], List[str]]:
+    words = np.array(vocabulary, dtype=object)
+
+    def candidates(s: str, max_distance: int) -> List[str]:
+        distances = batch_edit_distance(s, vocabulary)
+        hits = np.flatnonzero(distances <= max_distance)
+        hits = hits[np.argsort(distances[hits], kind="stable")]  # vocabulary is sorted, so ties stay alphabetical
+        return words[hits].tolist()
+    return candidates
+
+
+def distance_cases(count: int, seed: int = 0) -> List[Tuple[str, List[str]]]:
+    """(pattern, words) pairs; patterns run past 64 characters and word lists may hold empty words."""
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        length = rng.choice((0, 1, 2, 5, 8, 20, 63, 64, 65, 100))
+        s = "".join(rng.choice(DISTANCE_ALPHABET) for _ in range(length))
+        words = ["".join(rng.choice(DISTANCE_ALPHABET) for _ in range(rng.choice((0, 1, 3, 8, 70))))
+                 for _ in range(rng.randrange(6))]
+        cases.append((s, words))
+    return cases + [("abc", []), ("", ["", "a"]), ("abc", ["", ""]), ("𝔘" * 70, ["𝔘" * 64, "", "a𝔘"])]
+
+
+def test_matches_edit_distance() -> None:
+    for s, words in distance_cases(2000):
+        expected = [edit_distance(s, w) for w in words]
+        assert [myers_distance(s, w) for w in words] == expected, (s, words)
+        assert batch_edit_distance(s, words).tolist() == expected, (s, words)
+
+
+def run(sizes: List[int], distances: List[int], queries: int, brute_queries: int, seed: int = 0) -> None:
+    print(f"{'size':>9} {'structure':<8} {'build (s)':>9} {'k':>2} {'query (ms)':>11} {'speedup':>9}  check")
+    for size in sizes:
+        vocabulary = generate_vocabulary(size, seed)
+        rng = random.Random(seed + 1)
+        misspellings = [misspell(rng.choice(vocabulary), rng) for _ in range(queries)]
+        searches: Dict[str, Callable[[str, int], List[str]]] = {"numpy": batched(vocabulary)}
+        builds: Dict[str, float] = {"numpy": 0.0}
+        for name, cls in (("bktree", BKTree), ("trie", Trie), ("delete", DeleteIndex)):
+            start = time.perf_counter()
+            structure = cls(vocabulary, max(distances)) if cls is DeleteIndex else cls(vocabulary)
+            builds[name] = time.perf_counter() - start
+            searches[name] = structure.candidates
+        brute = brute_force(vocabulary)
+        for k in distances:
+            start = time.perf_counter()
+            expected = [brute(s, k) for s in misspellings[:brute_queries]]
+            brute_ms = (time.perf_counter() - start) * 1000 / max(1, len(expected))
+            print(f"{size:>9} {'brute':<8} {0.0:>9.2f} {k:>2} {brute_ms:>11.3f} {1.0:>8.1f}x")
+            for name, search in searches.items():
+                start = time.perf_counter()
+                results = [search(s, k) for s in misspellings]
+                query_ms = (time.perf_counter() - start) * 1000 / len(misspellings)
+                check = "ok" if results[:len(expected)] == expected else "MISMATCH"
+                print(f"{size:>9} {name:<8} {builds[name]:>9.2f} {k:>2} {query_ms:>11.3f} "
+                      f"{brute_ms / query_ms:>8.1f}x  {check}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dictionary search for the Question 4 corrector")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="vocabulary sizes")
+    parser.add_argument("--distances", type=int, nargs="+", default=[1, 2], help="edit distances k to query")
+    parser.add_argument("--queries", type=int, default=200, help="misspellings searched per structure")
+    parser.add_argument("--brute-queries", type=int, default=5,
+                        help="misspellings searched by brute force (it is slow on large vocabularies)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    run(args.sizes, args.distances, args.queries, args.brute_queries, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,10 +12,30 @@ Assumptions:
 - P(w) = uniform prior (1 / |V|) for simplicity.
 
 Formula: Best correction w* = argmax_{w in candidates} P(s|w) * P(w)
+
+When no candidates are given they are looked up in a DeleteIndex built once over
+V and passed in: every dictionary word within a small edit distance of s, found
+without scanning V.
+BKTree and Trie answer the same query with other trade-offs (see benchmark.py).
+
+Instead of the constant P(s|w), a ChannelModel learned from a file of
+(misspelling, correction) pairs (spelling_pairs.tsv) weights each deletion,
+insertion, substitution and transposition by per-character confusion counts.
+
+BatchCorrector corrects whole token streams: in-vocabulary words are passed
+through after a set lookup, and each distinct misspelling is corrected once and
+remembered in an LRU cache shared by all batches.
 """
 
-from typing import List, Dict, Set
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+import math
+import os
 import re
+import string
+import time
+
+import numpy as np
 
 
 def edit_distance(s1: str, s2: str) -> int:
@@ -36,20 +56,501 @@ def edit_distance(s1: str, s2: str) -> int:
     return previous_row[-1]
 
 
+def _match_masks(pattern: str) -> Dict[str, int]:
+    masks: Dict[str, int] = {}
+    for i, c in enumerate(pattern):
+        masks[c] = masks.get(c, 0) | (1 << i)
+    return masks
+
+
+def myers_distance(s1: str, s2: str) -> int:
+    """
+    Levenshtein distance with Myers' bit-parallel algorithm (Hyyro's formulation).
+
+    One DP column is held as two bit vectors of vertical +1/-1 deltas over the
+    shorter string, so each character of the longer string costs a constant
+    number of integer operations instead of a row of min() calls. Bits fit a
+    machine word up to 64 characters; Python ints keep it correct beyond that.
+    Same result as edit_distance, which stays the reference implementation.
+    """
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    m = len(s2)
+    if m == 0:
+        return len(s1)
+    masks = _match_masks(s2)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for c in s1:
+        eq = masks.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv & full
+    return score
+
+
+def batch_edit_distance(s: str, words: Sequence[str]) -> np.ndarray:
+    """
+    Levenshtein distance from s to every word, computed for all words at once.
+
+    Runs the Myers recurrence with s as the pattern (one uint64 bit vector per
+    word) and steps through the words' characters column by column, so the
+    Python loop runs max(len(word)) times whatever the number of words. The
+    words are concatenated into one uint8 array of per-character ids (0 = not
+    in s) and sorted by length, longest first; step i gathers the i-th id of
+    the words longer than i, and a word's distance is read off at the step
+    equal to its length. Patterns longer than 64 characters fall back to
+    myers_distance per word.
+    """
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+    m = len(s)
+    if m == 0 or not len(words):
+        return lengths.copy()
+    if m > 64:
+        return np.array([myers_distance(s, w) for w in words], dtype=np.int64)
+
+    order = np.argsort(-lengths, kind="stable")
+    sorted_lengths = lengths[order]
+    if sorted_lengths[0] == 0:  # only empty words: each is m insertions away
+        return np.full(len(words), m, dtype=np.int64)
+    # active[i] = number of words longer than i, i.e. still being scanned at step i
+    active = np.searchsorted(-sorted_lengths, -np.arange(int(sorted_lengths[0]) + 1), side="left")
+    starts = (np.cumsum(lengths) - lengths)[order]
+
+    # Character ids: position of the code point among the distinct characters of s, plus one.
+    # s has at most 64 of them, so ids fit a uint8; the lookup runs in blocks to bound temporaries.
+    keys = sorted(set(map(ord, s)))
+    key_array = np.array(keys, dtype=np.uint32)
+    flat = np.frombuffer("".join(words).encode("utf-32-le"), dtype=np.uint32)
+    ids = np.empty(len(flat), dtype=np.uint8)
+    for block in range(0, len(flat), 1 << 16):
+        chars = flat[block:block + (1 << 16)]
+        position = np.searchsorted(key_array, chars)
+        found = key_array[np.minimum(position, len(keys) - 1)] == chars
+        ids[block:block + len(chars)] = np.where(found, position + 1, 0)
+
+    masks = _match_masks(s)
+    peq = np.zeros(len(keys) + 1, dtype=np.uint64)
+    for i, key in enumerate(keys, 1):
+        peq[i] = masks[chr(key)]
+
+    one = np.uint64(1)
+    full = np.uint64((1 << m) - 1)
+    last = np.uint64(1 << (m - 1))
+    pv = np.full(len(words), full, dtype=np.uint64)
+    mv = np.zeros(len(words), dtype=np.uint64)
+    score = np.full(len(words), m, dtype=np.int64)
+    for i in range(int(sorted_lengths[0])):
+        n = active[i]
+        eq = peq[ids[starts[:n] + i]]
+        p, q = pv[:n], mv[:n]
+        xv = eq | q
+        xh = (((eq & p) + p) ^ p) | eq
+        ph = q | ~(xh | p)
+        mh = p & xh
+        score[:n] += (ph & last) != 0
+        score[:n] -= (mh & last) != 0
+        ph = (ph << one) | one
+        mh = mh << one
+        pv[:n] = (mh | ~(xv | ph)) & full
+        mv[:n] = ph & xv & full
+    result = np.empty(len(words), dtype=np.int64)
+    result[order] = score
+    return result
+
+
 def is_single_edit(s: str, w: str) -> bool:
     """Check if s can be derived from w with exactly one edit."""
     return edit_distance(s, w) == 1
 
 
-def noisy_channel_corrector(s: str, candidates: List[str], V: Set[str], prior_probs: Dict[str, float]) -> str:
+# Left context of an edit at the start of a word; never equal to a real character.
+WORD_START = ""
+
+
+def osa_alignment(typed: str, intended: str) -> List[Tuple[str, str, str]]:
+    """
+    Cheapest edits turning intended into typed under optimal string alignment
+    (Damerau-Levenshtein where adjacent transpositions cost 1, no edits of a
+    transposed pair).
+
+    Returns (op, x, y) tuples in the confusion-matrix convention of Kernighan,
+    Church and Gale: ("del", x, y) xy typed as x, ("ins", x, y) x typed as xy,
+    ("sub", x, y) x typed as y, ("trans", x, y) xy typed as yx. WORD_START
+    stands for the start of the word.
+    """
+    n, m = len(intended), len(typed)
+    d = [[0] * (m + 1) for _ in range(n + 1)]
+    for i in range(n + 1):
+        d[i][0] = i
+    for j in range(m + 1):
+        d[0][j] = j
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (intended[i - 1] != typed[j - 1]))
+            if i > 1 and j > 1 and intended[i - 1] == typed[j - 2] and intended[i - 2] == typed[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    ops = []
+    i, j = n, m
+    while i or j:
+        if i and j and intended[i - 1] == typed[j - 1] and d[i][j] == d[i - 1][j - 1]:
+            i, j = i - 1, j - 1
+        elif i and j and d[i][j] == d[i - 1][j - 1] + 1:
+            ops.append(("sub", intended[i - 1], typed[j - 1]))
+            i, j = i - 1, j - 1
+        elif (i > 1 and j > 1 and intended[i - 1] == typed[j - 2] and intended[i - 2] == typed[j - 1]
+              and d[i][j] == d[i - 2][j - 2] + 1):
+            ops.append(("trans", intended[i - 2], intended[i - 1]))
+            i, j = i - 2, j - 2
+        elif i and d[i][j] == d[i - 1][j] + 1:
+            ops.append(("del", intended[i - 2] if i > 1 else WORD_START, intended[i - 1]))
+            i -= 1
+        else:
+            ops.append(("ins", typed[j - 2] if j > 1 else WORD_START, typed[j - 1]))
+            j -= 1
+    ops.reverse()
+    return ops
+
+
+def osa_distance(s1: str, s2: str) -> int:
+    """Optimal string alignment distance: Levenshtein plus adjacent transpositions at cost 1."""
+    return len(osa_alignment(s1, s2))
+
+
+class ChannelModel:
+    """
+    Noisy channel P(s|w) from per-character confusion matrices (Kernighan, Church and Gale).
+
+    Counts of each deletion, insertion, substitution and transposition are
+    learned from (misspelling, correction) pairs via osa_alignment, and
+    character unigram/bigram counts from the corrections give the number of
+    chances each edit had. Both are turned once into dense arrays of edit costs
+    -log P(edit), indexed by character id, with add-alpha smoothing:
+
+        del[x, y]   / count[xy]      ins[x, y] / count[x]
+        sub[x, y]   / count[x]       trans[x, y] / count[xy]
+
+    A candidate one edit away from the typed word is scored with a single table
+    lookup; anything further away with a weighted optimal string alignment over
+    the same tables, so P(s|w) is the probability of the cheapest edit sequence.
+    """
+
+    ALPHABET = string.ascii_lowercase + "'-"
+    # Id 0 is WORD_START, ALPHABET takes 1..len(ALPHABET) and every other
+    # character shares the last row/column.
+    SIZE = len(ALPHABET) + 2
+
+    @classmethod
+    def _ids(cls) -> Dict[str, int]:
+        ids = {c: i for i, c in enumerate(cls.ALPHABET, 1)}
+        ids[WORD_START] = 0
+        return ids
+
+    def __init__(self, deletions: np.ndarray, insertions: np.ndarray, substitutions: np.ndarray,
+                 transpositions: np.ndarray, unigrams: np.ndarray, bigrams: np.ndarray, alpha: float = 0.5):
+        self.ids = self._ids()
+        self.other = self.SIZE - 1
+        size = self.SIZE
+        self.counts = {"del": deletions, "ins": insertions, "sub": substitutions, "trans": transpositions,
+                       "unigrams": unigrams, "bigrams": bigrams}
+        self.del_cost = -np.log((deletions + alpha) / (bigrams + alpha * size))
+        self.ins_cost = -np.log((insertions + alpha) / (unigrams[:, None] + alpha * size))
+        self.sub_cost = -np.log((substitutions + alpha) / (unigrams[:, None] + alpha * size))
+        self.trans_cost = -np.log((transpositions + alpha) / (bigrams + alpha * size))
+        # Scoring reads single cells, which is several times faster from nested lists than from numpy.
+        self._del, self._ins, self._sub, self._trans = (
+            table.tolist() for table in (self.del_cost, self.ins_cost, self.sub_cost, self.trans_cost))
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[str, str]], alpha: float = 0.5) -> "ChannelModel":
+        """Learn the confusion matrices from (misspelling, correction) pairs."""
+        ids = cls._ids()
+        size = cls.SIZE
+        counts = {op: np.zeros((size, size)) for op in ("del", "ins", "sub", "trans")}
+        unigrams = np.zeros(size)
+        bigrams = np.zeros((size, size))
+        for typed, intended in pairs:
+            chars = [0] + [ids.get(c, size - 1) for c in intended]
+            np.add.at(unigrams, chars, 1)
+            np.add.at(bigrams, (chars[:-1], chars[1:]), 1)
+            for op, x, y in osa_alignment(typed, intended):
+                counts[op][ids.get(x, size - 1), ids.get(y, size - 1)] += 1
+        return cls(counts["del"], counts["ins"], counts["sub"], counts["trans"], unigrams, bigrams, alpha)
+
+    @classmethod
+    def from_file(cls, path: str, alpha: float = 0.5) -> "ChannelModel":
+        """Read tab-separated "misspelling<TAB>correction" lines."""
+        with open(path, encoding="utf-8") as f:
+            pairs = [tuple(line.rstrip("\n").split("\t")[:2]) for line in f if "\t" in line]
+        return cls.from_pairs(((typed.lower(), intended.lower()) for typed, intended in pairs), alpha)
+
+    def _encode(self, word: str) -> List[int]:
+        ids, other = self.ids, self.other
+        return [0] + [ids.get(c, other) for c in word]  # position 0 is WORD_START
+
+    def _single_edit_cost(self, s: List[int], w: List[int]) -> Optional[float]:
+        n, m = len(w), len(s)
+        p = 0
+        while p < n and p < m and w[p] == s[p]:
+            p += 1
+        q = 0
+        while q < n - p and q < m - p and w[n - 1 - q] == s[m - 1 - q]:
+            q += 1
+        intended, typed = w[p:n - q], s[p:m - q]
+        if len(intended) == 1 and len(typed) == 1:
+            return self._sub[intended[0]][typed[0]]
+        if len(intended) == 1 and not typed:
+            return self._run_cost(self._del, w, p)
+        if not intended and len(typed) == 1:
+            return self._run_cost(self._ins, s, p)
+        if len(intended) == 2 and typed == intended[::-1]:
+            return self._trans[intended[0]][intended[1]]
+        return None
+
+    @staticmethod
+    def _run_cost(table: List[List[float]], chars: List[int], p: int) -> float:
+        # Removing any letter of a run like "dd" gives the same string, so the
+        # edit may also be read at the start of the run with a different context.
+        c = chars[p]
+        start = p
+        while start > 1 and chars[start - 1] == c:
+            start -= 1
+        return min(table[chars[p - 1]][c], table[chars[start - 1]][c])
+
+    def _alignment_cost(self, s: List[int], w: List[int]) -> float:
+        n, m = len(w), len(s)
+        dele, ins, sub, trans = self._del, self._ins, self._sub, self._trans
+        d = [[0.0] * m for _ in range(n)]
+        for i in range(1, n):
+            d[i][0] = d[i - 1][0] + dele[w[i - 1]][w[i]]
+        for j in range(1, m):
+            d[0][j] = d[0][j - 1] + ins[s[j - 1]][s[j]]
+        for i in range(1, n):
+            wi = w[i]
+            for j in range(1, m):
+                sj = s[j]
+                best = d[i - 1][j - 1] + (0.0 if wi == sj else sub[wi][sj])
+                best = min(best, d[i - 1][j] + dele[w[i - 1]][wi], d[i][j - 1] + ins[s[j - 1]][sj])
+                if i > 1 and j > 1 and wi == s[j - 1] and w[i - 1] == sj:
+                    best = min(best, d[i - 2][j - 2] + trans[w[i - 1]][wi])
+                d[i][j] = best
+        return d[n - 1][m - 1]
+
+    def cost(self, s: str, w: str) -> float:
+        """-log P(s|w): negative log probability that w was typed as s."""
+        typed, intended = self._encode(s), self._encode(w)
+        if typed == intended:
+            return 0.0
+        single = self._single_edit_cost(typed, intended)
+        return single if single is not None else self._alignment_cost(typed, intended)
+
+    def probability(self, s: str, w: str) -> float:
+        """P(s|w) under the learned confusion matrices."""
+        return math.exp(-self.cost(s, w))
+
+
+def deletes(word: str, max_deletes: int) -> Set[str]:
+    """All strings obtained from word by deleting up to max_deletes characters (word included)."""
+    result = {word}
+    level = {word}
+    for _ in range(max_deletes):
+        level = {w[:i] + w[i + 1:] for w in level for i in range(len(w))}
+        result |= level
+    return result
+
+
+class DeleteIndex:
+    """
+    Symmetric delete candidate index over a dictionary (the SymSpell method).
+
+    Every dictionary word is stored under each string obtained by deleting up to
+    max_distance characters from it. Two words are within max_distance edits
+    only if deleting at most max_distance characters from each makes them equal,
+    so a lookup generates the deletes of the query, collects the words stored
+    under them and verifies each with myers_distance. The work depends on the
+    length of the query and max_distance, not on the size of the dictionary.
+
+    Only the first prefix_length characters are indexed, which bounds the number
+    of keys per word; the prefixes of two words within k edits are themselves
+    within k deletes of a common string, so no candidate is lost. Keys are
+    stored as hashes of the deletes rather than the strings themselves; a hash
+    collision only adds a candidate that the distance check rejects. Most
+    keys belong to a single word, so they map to a bare word id and only shared
+    keys hold a list.
+    """
+
+    def __init__(self, words: Iterable[str], max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words: List[str] = []
+        self.index: Dict[int, Union[int, List[int]]] = {}
+        for word in dict.fromkeys(words):
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        word_id = len(self.words)
+        self.words.append(word)
+        index = self.index
+        for key in map(hash, deletes(word[:self.prefix_length], self.max_distance)):
+            entry = index.get(key)
+            if entry is None:
+                index[key] = word_id
+            elif isinstance(entry, int):
+                index[key] = [entry, word_id]
+            else:
+                entry.append(word_id)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def candidates(self, s: str, max_distance: Optional[int] = None) -> List[str]:
+        """
+        Dictionary words within max_distance edits of s, nearest first (ties alphabetical).
+
+        max_distance defaults to the index's own and cannot exceed it: deletes
+        beyond that were never indexed, so ValueError is raised instead.
+        """
+        if max_distance is None:
+            max_distance = self.max_distance
+        elif max_distance > self.max_distance:
+            raise ValueError(f"max_distance {max_distance} exceeds the index's max_distance {self.max_distance}")
+        k = max_distance
+        seen: Set[int] = set()
+        found = []
+        for key in deletes(s[:self.prefix_length], k):
+            entry = self.index.get(hash(key), ())
+            for word_id in (entry,) if isinstance(entry, int) else entry:
+                if word_id in seen:
+                    continue
+                seen.add(word_id)
+                w = self.words[word_id]
+                if abs(len(w) - len(s)) > k:
+                    continue
+                distance = myers_distance(s, w)
+                if distance <= k:
+                    found.append((distance, w))
+        return [w for _, w in sorted(found)]
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over a dictionary, keyed on edit distance (myers_distance).
+
+    Each child hangs off its parent under their distance. Because edit distance
+    is a metric, a query at distance d from a node can only match inside the
+    children whose key lies in [d - k, d + k]; the others are skipped whole.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.root: Optional[list] = None  # [word, {distance: child}]
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        if self.root is None:
+            self.root = [word, {}]
+            self.size = 1
+            return
+        node = self.root
+        while True:
+            distance = myers_distance(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [word, {}]
+                self.size += 1
+                return
+            node = child
+
+    def __len__(self) -> int:
+        return self.size
+
+    def candidates(self, s: str, max_distance: int = 2) -> List[str]:
+        """Dictionary words within max_distance edits of s, nearest first (ties alphabetical)."""
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            word, children = stack.pop()
+            distance = myers_distance(s, word)
+            if distance <= max_distance:
+                found.append((distance, word))
+            for key, child in children.items():
+                if distance - max_distance <= key <= distance + max_distance:
+                    stack.append(child)
+        return [w for _, w in sorted(found)]
+
+
+class Trie:
+    """
+    Character trie over a dictionary, searched with one Levenshtein DP row per node.
+
+    Words sharing a prefix share the rows computed for it, so the DP is run once
+    per trie node instead of once per word, and a branch is abandoned as soon as
+    every entry of its row exceeds max_distance.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.root: dict = {}  # char -> child node; the None key holds the word ending here
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        if None not in node:
+            node[None] = word
+            self.size += 1
+
+    def __len__(self) -> int:
+        return self.size
+
+    def candidates(self, s: str, max_distance: int = 2) -> List[str]:
+        """Dictionary words within max_distance edits of s, nearest first (ties alphabetical)."""
+        found = []
+        first_row = list(range(len(s) + 1))
+        if None in self.root and first_row[-1] <= max_distance:
+            found.append((first_row[-1], self.root[None]))
+        stack = [(child, char, first_row) for char, child in self.root.items() if char is not None]
+        while stack:
+            node, char, previous_row = stack.pop()
+            row = [previous_row[0] + 1]
+            for j, c in enumerate(s, 1):
+                row.append(min(row[j - 1] + 1, previous_row[j] + 1, previous_row[j - 1] + (c != char)))
+            if None in node and row[-1] <= max_distance:
+                found.append((row[-1], node[None]))
+            if min(row) <= max_distance:
+                stack.extend((child, next_char, row) for next_char, child in node.items() if next_char is not None)
+        return [w for _, w in sorted(found)]
+
+
+def noisy_channel_corrector(s: str, candidates: Optional[List[str]], V: Set[str], prior_probs: Dict[str, float],
+                            index: Optional[DeleteIndex] = None, channel: Optional[ChannelModel] = None) -> str:
     """
     Correct the misspelled word s using noisy channel model.
 
     Args:
         s: Misspelled word.
-        candidates: List of candidate corrections.
+        candidates: List of candidate corrections, or None to look them up in index.
         V: Dictionary of valid words.
         prior_probs: Dictionary of prior probabilities for words in V.
+        index: DeleteIndex (or BKTree / Trie) over V, required when candidates is None.
+            Build it once and pass it to every call.
+        channel: Learned ChannelModel for P(s|w); the constant single-edit
+            probability below is used when it is not given.
 
     Returns:
         The best correction based on P(s|w) * P(w).
@@ -58,13 +559,20 @@ def noisy_channel_corrector(s: str, candidates: List[str], V: Set[str], prior_pr
     P_edit = 0.001  # Probability of single-edit error
     P_no_edit = 0.0  # Probability of no error (since s is misspelled)
 
+    if candidates is None:
+        if index is None:
+            raise ValueError("pass candidates or an index over V to look them up in")
+        candidates = index.candidates(s)
+
     best_score = -1
     best_word = None
 
     for w in candidates:
         if w not in V:
             continue  # Skip if not in dictionary
-        if is_single_edit(s, w):
+        if channel is not None:
+            P_sw = channel.probability(s, w)
+        elif is_single_edit(s, w):
             P_sw = P_edit
         else:
             P_sw = P_no_edit
@@ -77,6 +585,100 @@ def noisy_channel_corrector(s: str, candidates: List[str], V: Set[str], prior_pr
     return best_word if best_word else "No correction found"
 
 
+WORD = re.compile(r"[a-z]+(?:['-][a-z]+)*")
+
+
+class BatchCorrector:
+    """
+    Corrects token streams with noisy_channel_corrector, one batch at a time.
+
+    Per batch, tokens found in V (after lowercasing) cost a set lookup, tokens
+    that are not words (numbers, punctuation) are passed through, and the
+    remaining misspellings are deduplicated so each distinct one is corrected
+    once. Corrections are kept in an LRU cache of cache_size entries across
+    batches, so typos repeated through a document or corpus are corrected once.
+    Misspellings without a correction are left as typed.
+
+    Without an index, a DeleteIndex over V is built once per corrector; build a
+    new corrector (or pass a new index) after changing V.
+    """
+
+    def __init__(self, V: Set[str], prior_probs: Dict[str, float], index: Optional[DeleteIndex] = None,
+                 channel: Optional[ChannelModel] = None, cache_size: int = 1 << 16):
+        self.V = V
+        self.prior_probs = prior_probs
+        self.index = index if index is not None else DeleteIndex(V)
+        self.channel = channel
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self.latencies: List[float] = []  # seconds per batch
+        self.tokens = self.misspelled = self.hits = self.misses = 0
+
+    def correct_word(self, word: str) -> str:
+        """Correction of a lowercase misspelling, from the cache when possible."""
+        correction = self._cache.get(word)
+        if correction is not None:
+            self._cache.move_to_end(word)
+            self.hits += 1
+            return correction
+        self.misses += 1
+        correction = noisy_channel_corrector(word, None, self.V, self.prior_probs, self.index, self.channel)
+        if correction == "No correction found":
+            correction = word
+        self._cache[word] = correction
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return correction
+
+    def correct_batch(self, tokens: Sequence[str]) -> List[str]:
+        """Return tokens with every misspelled word replaced by its correction."""
+        start = time.perf_counter()
+        V = self.V
+        lowered = [token.lower() for token in tokens]
+        misspelled = {word for word in lowered if word not in V and WORD.fullmatch(word)}
+        corrections = {word: self.correct_word(word) for word in misspelled}
+        corrected = []
+        for token, word in zip(tokens, lowered):
+            correction = corrections.get(word)
+            if correction is None or correction == word:
+                corrected.append(token)
+            elif token[:1].isupper():
+                corrected.append(correction.upper() if token.isupper() and len(token) > 1 else correction.capitalize())
+            else:
+                corrected.append(correction)
+        self.tokens += len(tokens)
+        self.misspelled += sum(word in corrections for word in lowered)
+        self.latencies.append(time.perf_counter() - start)
+        return corrected
+
+    def correct_stream(self, tokens: Iterable[str], batch_size: int = 1024) -> Iterator[str]:
+        """Correct a (possibly unbounded) token stream in batches of batch_size tokens."""
+        batch = []
+        for token in tokens:
+            batch.append(token)
+            if len(batch) == batch_size:
+                yield from self.correct_batch(batch)
+                batch = []
+        if batch:
+            yield from self.correct_batch(batch)
+
+    def stats(self) -> Dict[str, float]:
+        """Token and cache counters plus p50/p90/p99/max batch latency in milliseconds."""
+        latencies = np.array(self.latencies or [0.0]) * 1000
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        return {
+            "batches": len(self.latencies),
+            "tokens": self.tokens,
+            "misspelled": self.misspelled,
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "p50_ms": float(p50),
+            "p90_ms": float(p90),
+            "p99_ms": float(p99),
+            "max_ms": float(latencies.max()),
+        }
+
+
 def main():
     # Dictionary V
     V = {"word", "world", "work", "worm", "worth"}
@@ -104,6 +706,30 @@ def main():
     print(f"Prior probabilities: {prior_probs}")
     print(f"Corrected word: {correction}")
 
+    # Candidates generated from a delete index over V instead of by hand
+    index = DeleteIndex(V)
+    print(f"Index candidates: {index.candidates(s)}")
+    print(f"Corrected word (index): {noisy_channel_corrector(s, None, V, prior_probs, index)}")
+
+    # P(s|w) from confusion matrices learned from (misspelling, correction) pairs
+    pairs_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spelling_pairs.tsv")
+    channel = None
+    if os.path.exists(pairs_path):
+        channel = ChannelModel.from_file(pairs_path)
+        for w in index.candidates(s):
+            print(f"P({s}|{w}) = {channel.probability(s, w):.6f}  edits: {osa_alignment(s, w)}")
+        print(f"Corrected word (channel): {noisy_channel_corrector(s, None, V, prior_probs, index, channel)}")
+
+    # Correcting a whole token stream, each distinct misspelling once
+    corrector = BatchCorrector(V | {"the", "of", "is", "and", "again"}, prior_probs, channel=channel)
+    tokens = "The wrod of the wrold is the word , wrok and Wrod again .".split()
+    print(f"Batch input: {' '.join(tokens)}")
+    print(f"Batch corrected: {' '.join(corrector.correct_stream(tokens, batch_size=4))}")
+    stats = corrector.stats()
+    print(f"Batch stats: {stats['tokens']} tokens, {stats['misspelled']} misspelled, "
+          f"{stats['cache_misses']} corrected, {stats['cache_hits']} from cache, "
+          f"p50 {stats['p50_ms']:.3f} ms, p99 {stats['p99_ms']:.3f} ms per batch")
+
 
 if __name__ == "__main__":
     main()
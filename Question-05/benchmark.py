@@ -0,0 +1,72 @@
+"""
+Benchmark of serial vs parallel map-reduce training for the Question 5 classifier
+
+The reviews of an IMDB-format CSV (review,sentiment columns) are read into
+mini-batches once, then the classifier is trained on them with:
+
+1. serial    - NaiveBayesSentimentClassifier.fit_stream, one process
+2. N workers - NaiveBayesSentimentClassifier.fit_parallel, batches counted in
+               N processes and the count tables merged in the parent
+
+Each parallel model is compared with the serial model.
+
+Usage:
+    python benchmark.py ["IMDB Dataset.csv"] [--rows 50000] [--workers 1 2 4 8] [--batch-size 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from main import NaiveBayesSentimentClassifier
+from main_imdb import iter_imdb_batches
+
+
+def same_model(a, b):
+    return (a.total_docs == b.total_docs and a.class_counts == b.class_counts and a.word_counts == b.word_counts
+            and a.classes == b.classes and a.vocab_index == b.vocab_index
+            and np.array_equal(a.log_likelihood, b.log_likelihood) and np.array_equal(a.log_prior, b.log_prior))
+
+
+def best_time(train, repeat):
+    best, model = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model = train()
+        best = min(best, time.perf_counter() - start)
+    return best, model
+
+
+def run(filename, rows, workers, batch_size, repeat=3):
+    batches = list(iter_imdb_batches(filename, batch_size, 0, rows))
+    documents = sum(len(labels) for _, labels in batches)
+    print(f"{documents} reviews in {len(batches)} batches of {batch_size}, {os.cpu_count()} CPUs")
+    print(f"{'trainer':<10} {'time (s)':>9} {'docs/s':>9} {'speedup':>8}  check")
+    serial, reference = best_time(lambda: NaiveBayesSentimentClassifier().fit_stream(batches), repeat)
+    print(f"{'serial':<10} {serial:>9.2f} {documents / serial:>9.0f} {1.0:>7.2f}x")
+    for count in workers:
+        seconds, model = best_time(lambda: NaiveBayesSentimentClassifier().fit_parallel(batches, count), repeat)
+        check = 'ok' if same_model(model, reference) else 'MISMATCH'
+        print(f"{f'{count} workers':<10} {seconds:>9.2f} {documents / seconds:>9.0f} {serial / seconds:>7.2f}x  {check}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark parallel training of the Question 5 classifier")
+    parser.add_argument("filename", nargs="?", default='IMDB Dataset.csv')
+    parser.add_argument("--rows", type=int, default=None, help="reviews to train on (default: all)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=2000, help="reviews counted per task")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.filename):
+        print(f"{args.filename} not found; download the IMDB 50K reviews CSV or pass its path", file=sys.stderr)
+        return 1
+    run(args.filename, args.rows, args.workers, args.batch_size, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,19 @@
 """Implement a text classifier for sentiment analysis using naive bayes theorem"""
 
+import argparse
 import re
 import csv
+import json
+import mmap
 import os
+import zlib
 from collections import defaultdict, Counter
-from math import log
+from multiprocessing import Pool
 from random import sample
 
+import numpy as np
+from scipy import sparse
+
 
 class Colors:
     GREEN = '\033[92m'
@@ -57,66 +64,295 @@ def load_csv_data(train_file='train.csv', test_file='test.csv', max_samples=None
     return train_docs, train_labels, test_docs, test_labels
 
 
+NON_LETTERS = re.compile(r'[^a-z\s]')
+
+# Saved model layout: MODEL_MAGIC, a little-endian uint64 header length, a JSON
+# header, then the sections it lists, each at a 64-byte aligned offset:
+#   log_prior       float32[classes]
+#   log_likelihood  float32[classes, vocabulary + 1]
+#   word_offsets    uint32[vocabulary + 1], start of each word in word_bytes
+#   word_bytes      the sorted vocabulary, UTF-8, concatenated
+#   slots           uint32[power of two >= 2 * vocabulary], open-addressing hash
+#                   table on crc32 of the word: 0 for empty, else word index + 1
+MODEL_MAGIC = b'NBSC\x01\x00\x00\x00'
+ALIGNMENT = 64
+
+
+class MappedVocabulary:
+    """
+    Read-only word -> column map over the string table and hash slots of a saved model.
+
+    Nothing is copied out of the mapping, so every process that loads the same
+    file shares its pages; a lookup is one crc32 and, on average, one probe.
+    """
+
+    def __init__(self, buffer, offsets, word_bytes_offset, slots):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._base = word_bytes_offset
+        self._slots = slots
+        self._mask = len(slots) - 1
+
+    def _word(self, index):
+        return self._buffer[self._base + self._offsets[index]:self._base + self._offsets[index + 1]]
+
+    def get(self, word, default=None):
+        key = word.encode('utf-8')
+        buffer, offsets, base, slots, mask = self._buffer, self._offsets, self._base, self._slots, self._mask
+        slot = zlib.crc32(key) & mask
+        while True:
+            entry = slots[slot]
+            if entry == 0:
+                return default
+            if buffer[base + offsets[entry - 1]:base + offsets[entry]] == key:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def __getitem__(self, word):
+        index = self.get(word)
+        if index is None:
+            raise KeyError(word)
+        return index
+
+    def __contains__(self, word):
+        return self.get(word) is not None
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __iter__(self):
+        return (self._word(i).decode('utf-8') for i in range(len(self)))
+
+    def to_dict(self):
+        """Private dict copy: faster lookups, at the cost of building it and of memory in every process."""
+        # Offsets count bytes, so each word is sliced before it is decoded.
+        return {self._word(i).decode('utf-8'): i for i in range(len(self))}
+
+
 class NaiveBayesSentimentClassifier:
+    """
+    Multinomial naive Bayes with add-one smoothing.
+
+    train() collects counts and then compiles them into arrays:
+      - vocab_index: word -> column, for the sorted vocabulary; unseen words
+        map to one extra OOV column
+      - log_likelihood: (classes x vocabulary+1) log P(word|class), where the
+        OOV column holds log(1 / (total words in class + |V|))
+      - log_prior: log P(class) per class
+    so scoring documents is a document-term count matrix times log_likelihood.T.
+
+    partial_fit() adds a batch of documents to the counts without keeping the
+    documents, so a corpus of any size can be streamed through it with memory
+    bounded by the vocabulary; the arrays are recompiled before the next
+    prediction. Training in batches gives exactly the model train() gives on
+    the concatenated batches.
+    """
+
     def __init__(self):
         self.class_counts = Counter()
         self.word_counts = defaultdict(Counter)
         self.vocabulary = set()
         self.total_docs = 0
+        self.classes = []
+        self.vocab_index = {}
+        self.log_likelihood = np.zeros((0, 1))
+        self.log_prior = np.zeros(0)
+        self._stale = False
 
     def preprocess(self, text):
-        text = text.lower()
-        text = re.sub(r'[^a-z\s]', '', text)
-        return text.split()
+        return NON_LETTERS.sub('', text.lower()).split()
 
     def train(self, documents, labels):
-        self.total_docs = len(documents)
-        
+        self.partial_fit(documents, labels)
+        self.compile()
+
+    def partial_fit(self, documents, labels):
+        """Add one batch of labelled documents to the counts."""
         for doc, label in zip(documents, labels):
+            self.total_docs += 1
             self.class_counts[label] += 1
             words = self.preprocess(doc)
-            
-            for word in words:
-                self.vocabulary.add(word)
-                self.word_counts[label][word] += 1
+            self.vocabulary.update(words)
+            self.word_counts[label].update(words)
+        self._stale = True
+        return self
+
+    def fit_stream(self, batches):
+        """Train on an iterable of (documents, labels) batches, e.g. from a streaming CSV reader."""
+        for documents, labels in batches:
+            self.partial_fit(documents, labels)
+        self.compile()
+        return self
+
+    def fit_parallel(self, batches, workers=None):
+        """
+        fit_stream with the counting spread over worker processes.
+
+        Naive Bayes counts are additive, so each batch is preprocessed and
+        counted in a worker (map) and the count tables are merged here in
+        batch order (reduce), which gives exactly the fit_stream model.
+        """
+        with Pool(workers) as pool:
+            for total_docs, class_counts, word_counts in pool.imap(_count_batch, batches):
+                self.merge_counts(total_docs, class_counts, word_counts)
+        self.compile()
+        return self
+
+    def merge_counts(self, total_docs, class_counts, word_counts):
+        """Add count tables from another model trained on other documents."""
+        self.total_docs += total_docs
+        self.class_counts.update(class_counts)
+        for label, counts in word_counts.items():
+            self.word_counts[label].update(counts)
+            self.vocabulary.update(counts)
+        self._stale = True
+
+    def compile(self):
+        """Precompute the vocabulary index, log-likelihood matrix and log-prior vector from the counts."""
+        self.classes = list(self.class_counts)
+        self.vocab_index = {word: i for i, word in enumerate(sorted(self.vocabulary))}
+        vocab_size = len(self.vocab_index)
+        counts = np.zeros((len(self.classes), vocab_size + 1))
+        for row, class_label in enumerate(self.classes):
+            word_counts = self.word_counts[class_label]
+            columns = [self.vocab_index[word] for word in word_counts]
+            counts[row, columns] = list(word_counts.values())
+        totals = counts.sum(axis=1, keepdims=True)
+        self.log_likelihood = np.log((counts + 1) / (totals + vocab_size))
+        self.log_prior = np.log(np.array([self.class_counts[c] for c in self.classes]) / self.total_docs)
+        self._stale = False
+
+    def vectorize(self, documents):
+        """Sparse (documents x vocabulary+1) word count matrix; unseen words are counted in the last column."""
+        if self._stale:
+            self.compile()
+        oov = len(self.vocab_index)
+        get = self.vocab_index.get
+        indptr, indices = [0], []
+        for doc in documents:
+            indices.extend(get(word, oov) for word in self.preprocess(doc))
+            indptr.append(len(indices))
+        data = np.ones(len(indices))
+        matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, oov + 1))
+        matrix.sum_duplicates()
+        return matrix
+
+    def log_probabilities(self, documents):
+        """(documents x classes) log P(class) + sum of log P(word|class), columns ordered as self.classes."""
+        return np.asarray(self.vectorize(documents) @ self.log_likelihood.T) + self.log_prior
 
     def calculate_log_probability(self, document, class_label):
-        words = self.preprocess(document)
-        
-        log_prob = log(self.class_counts[class_label] / self.total_docs)
-        
-        total_words_in_class = sum(self.word_counts[class_label].values())
-        vocab_size = len(self.vocabulary)
-        
-        for word in words:
-            word_count = self.word_counts[class_label][word]
-            log_prob += log((word_count + 1) / (total_words_in_class + vocab_size))
-        
-        return log_prob
+        if self._stale:
+            self.compile()
+        oov = len(self.vocab_index)
+        columns = [self.vocab_index.get(word, oov) for word in self.preprocess(document)]
+        row = self.classes.index(class_label)
+        return float(self.log_prior[row] + self.log_likelihood[row, columns].sum())
 
     def predict(self, document):
-        class_probs = {}
-        
-        for class_label in self.class_counts:
-            class_probs[class_label] = self.calculate_log_probability(document, class_label)
-        
-        return max(class_probs, key=class_probs.get), class_probs
+        scores = self.log_probabilities([document])[0]
+        class_probs = dict(zip(self.classes, scores.tolist()))
+        return self.classes[int(scores.argmax())], class_probs
+
+    def predict_batch(self, documents):
+        """Predicted labels for many documents with one sparse matrix product."""
+        if not documents:
+            return []
+        best = self.log_probabilities(documents).argmax(axis=1)
+        return [self.classes[i] for i in best]
 
     def evaluate(self, test_documents, test_labels):
-        correct = 0
-        predictions = []
-        
-        for doc, true_label in zip(test_documents, test_labels):
-            pred_label, _ = self.predict(doc)
-            predictions.append(pred_label)
-            if pred_label == true_label:
-                correct += 1
-        
+        predictions = self.predict_batch(test_documents)
+        correct = sum(p == t for p, t in zip(predictions, test_labels))
         accuracy = correct / len(test_documents)
         return accuracy, predictions
 
+    def save(self, path):
+        """Write the compiled model (float32 arrays and vocabulary hash table) in the format described at MODEL_MAGIC."""
+        if self._stale:
+            self.compile()
+        words = [word.encode('utf-8') for word in sorted(self.vocab_index, key=self.vocab_index.get)]
+        offsets = np.zeros(len(words) + 1, dtype='<u4')
+        np.cumsum([len(word) for word in words], out=offsets[1:])
+        slot_count = 1
+        while slot_count < 2 * len(words):
+            slot_count *= 2
+        slots = np.zeros(slot_count, dtype='<u4')
+        for index, word in enumerate(words):
+            slot = zlib.crc32(word) & (slot_count - 1)
+            while slots[slot]:
+                slot = (slot + 1) & (slot_count - 1)
+            slots[slot] = index + 1
+        sections = [
+            ('log_prior', self.log_prior.astype('<f4').tobytes()),
+            ('log_likelihood', self.log_likelihood.astype('<f4').tobytes()),
+            ('word_offsets', offsets.tobytes()),
+            ('word_bytes', b''.join(words)),
+            ('slots', slots.tobytes()),
+        ]
+        header = {'classes': self.classes, 'class_counts': [self.class_counts[c] for c in self.classes],
+                  'total_docs': self.total_docs, 'vocabulary_size': len(words), 'slots': slot_count}
+        # Offsets depend on the header length, which depends on the offsets; reserve digits for them first.
+        header['sections'] = {name: [10 ** 12, len(data)] for name, data in sections}
+        start = -(-(len(MODEL_MAGIC) + 8 + len(json.dumps(header))) // ALIGNMENT) * ALIGNMENT
+        for name, data in sections:
+            header['sections'][name] = [start, len(data)]
+            start = -(-(start + len(data)) // ALIGNMENT) * ALIGNMENT
+        encoded = json.dumps(header).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(MODEL_MAGIC + len(encoded).to_bytes(8, 'little') + encoded)
+            for name, data in sections:
+                f.write(b'\0' * (header['sections'][name][0] - f.tell()))
+                f.write(data)
+
+    @classmethod
+    def load(cls, path, copy_vocabulary=False):
+        """
+        Memory-map a model written by save(). The arrays and vocabulary are views
+        of the file, so loading costs no parsing and processes share the pages;
+        copy_vocabulary=True trades that for a dict vocabulary with faster lookups.
+        A loaded model only predicts: its word counts are not stored.
+        """
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[:len(MODEL_MAGIC)] != MODEL_MAGIC:
+            raise ValueError(f"{path} is not a saved NaiveBayesSentimentClassifier")
+        header_length = int.from_bytes(buffer[len(MODEL_MAGIC):len(MODEL_MAGIC) + 8], 'little')
+        header_start = len(MODEL_MAGIC) + 8
+        header = json.loads(buffer[header_start:header_start + header_length])
+        sections = header['sections']
+        classes, vocabulary_size = header['classes'], header['vocabulary_size']
+
+        def array(name, dtype):
+            offset, length = sections[name]
+            return np.frombuffer(buffer, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=offset)
+
+        model = cls()
+        model.classes = classes
+        model.class_counts = Counter(dict(zip(classes, header['class_counts'])))
+        model.total_docs = header['total_docs']
+        model.log_prior = array('log_prior', '<f4')
+        model.log_likelihood = array('log_likelihood', '<f4').reshape(len(classes), vocabulary_size + 1)
+        offsets = memoryview(buffer)[sections['word_offsets'][0]:sum(sections['word_offsets'])].cast('I')
+        slots = memoryview(buffer)[sections['slots'][0]:sum(sections['slots'])].cast('I')
+        model.vocab_index = MappedVocabulary(buffer, offsets, sections['word_bytes'][0], slots)
+        if copy_vocabulary:
+            model.vocab_index = model.vocab_index.to_dict()
+        return model
+
+
+def _count_batch(batch):
+    documents, labels = batch
+    model = NaiveBayesSentimentClassifier().partial_fit(documents, labels)
+    return model.total_docs, model.class_counts, model.word_counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Naive Bayes sentiment classifier")
+    parser.add_argument("--load", metavar="MODEL", help="load a saved model instead of training on train.csv")
+    parser.add_argument("--save", metavar="MODEL", help="save the trained model")
+    args = parser.parse_args(argv)
 
-def main():
     print("=" * 80)
     print("Naive Bayes Sentiment Analysis Classifier")
     print("=" * 80)
@@ -127,16 +363,22 @@ def main():
         max_samples=2000
     )
     
-    print(f"\nTrain: {len(train_docs)} | Test: {len(test_docs)}")
-    
-    train_sentiment_counts = Counter(train_labels)
-    for sentiment, count in train_sentiment_counts.items():
-        print(f"  {colorize(sentiment, sentiment)}: {count}")
-    
-    classifier = NaiveBayesSentimentClassifier()
-    classifier.train(train_docs, train_labels)
+    if args.load:
+        classifier = NaiveBayesSentimentClassifier.load(args.load)
+        print(f"\nLoaded {args.load} | Test: {len(test_docs)}")
+    else:
+        print(f"\nTrain: {len(train_docs)} | Test: {len(test_docs)}")
+        
+        train_sentiment_counts = Counter(train_labels)
+        for sentiment, count in train_sentiment_counts.items():
+            print(f"  {colorize(sentiment, sentiment)}: {count}")
+        
+        classifier = NaiveBayesSentimentClassifier()
+        classifier.train(train_docs, train_labels)
+        if args.save:
+            classifier.save(args.save)
     
-    print(f"\nVocabulary: {len(classifier.vocabulary)} words")
+    print(f"\nVocabulary: {len(classifier.vocab_index)} words")
     
     print("\n" + "=" * 80)
     print("Sample Predictions (20 random)")
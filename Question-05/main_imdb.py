@@ -1,11 +1,12 @@
 """Naive Bayes classifier for IMDB 50K movie reviews dataset"""
 
-import re
+import argparse
 import csv
-from collections import defaultdict, Counter
-from math import log
+from itertools import islice
 from random import sample
 
+from main import NaiveBayesSentimentClassifier as BaseNaiveBayesClassifier
+
 
 class Colors:
     GREEN = '\033[92m'
@@ -18,58 +19,41 @@ def colorize(text, sentiment):
     return f"{Colors.GREEN}{text}{Colors.RESET}" if sentiment == 'positive' else f"{Colors.RED}{text}{Colors.RESET}"
 
 
-class NaiveBayesSentimentClassifier:
-    def __init__(self):
-        self.class_counts = Counter()
-        self.word_counts = defaultdict(Counter)
-        self.vocabulary = set()
-        self.total_docs = 0
-
-    def preprocess(self, text):
-        text = text.lower()
-        text = re.sub(r'[^a-z\s]', '', text)
-        return text.split()
-
-    def train(self, documents, labels):
-        self.total_docs = len(documents)
-        for doc, label in zip(documents, labels):
-            self.class_counts[label] += 1
-            for word in self.preprocess(doc):
-                self.vocabulary.add(word)
-                self.word_counts[label][word] += 1
+class NaiveBayesSentimentClassifier(BaseNaiveBayesClassifier):
+    """The Question 5 classifier; here predict returns only the label and evaluate only the accuracy."""
 
     def predict(self, document):
-        class_probs = {}
-        for class_label in self.class_counts:
-            words = self.preprocess(document)
-            log_prob = log(self.class_counts[class_label] / self.total_docs)
-            total_words = sum(self.word_counts[class_label].values())
-            vocab_size = len(self.vocabulary)
-            
-            for word in words:
-                count = self.word_counts[class_label][word]
-                log_prob += log((count + 1) / (total_words + vocab_size))
-            
-            class_probs[class_label] = log_prob
-        
-        return max(class_probs, key=class_probs.get)
+        return super().predict(document)[0]
 
     def evaluate(self, test_docs, test_labels):
-        correct = sum(1 for doc, true in zip(test_docs, test_labels) if self.predict(doc) == true)
-        return correct / len(test_docs)
+        return super().evaluate(test_docs, test_labels)[0]
+
+
+def iter_imdb_rows(filename='IMDB Dataset.csv', start=0, stop=None):
+    """Stream (review, sentiment) pairs for rows start..stop of the CSV without loading the file"""
+    with open(filename, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+        rows = ((row['review'], row['sentiment'].strip().lower())
+                for row in csv.DictReader(f) if 'review' in row and 'sentiment' in row)
+        yield from islice(rows, start, stop)
+
+
+def iter_imdb_batches(filename='IMDB Dataset.csv', batch_size=1000, start=0, stop=None):
+    """Stream the CSV as (reviews, sentiments) mini-batches for partial_fit"""
+    rows = iter_imdb_rows(filename, start, stop)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        reviews, sentiments = zip(*batch)
+        yield list(reviews), list(sentiments)
 
 
 def load_imdb_data(filename='IMDB Dataset.csv', train_size=5000, test_size=1000):
-    """Load IMDB dataset and split into train/test"""
-    reviews, sentiments = [], []
-    
-    with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if 'review' in row and 'sentiment' in row:
-                reviews.append(row['review'])
-                sentiments.append(row['sentiment'].strip().lower())
-    
+    """Load IMDB dataset and split into train/test, reading only the rows that are used"""
+    rows = list(iter_imdb_rows(filename, 0, train_size + test_size))
+    reviews = [review for review, _ in rows]
+    sentiments = [sentiment for _, sentiment in rows]
+
     train_docs = reviews[:train_size]
     train_labels = sentiments[:train_size]
     test_docs = reviews[train_size:train_size + test_size]
@@ -78,23 +62,37 @@ def load_imdb_data(filename='IMDB Dataset.csv', train_size=5000, test_size=1000)
     return train_docs, train_labels, test_docs, test_labels
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Naive Bayes on the IMDB 50K reviews, trained from a CSV stream")
+    parser.add_argument("filename", nargs="?", default='IMDB Dataset.csv')
+    parser.add_argument("--train-size", type=int, default=5000, help="rows streamed into training")
+    parser.add_argument("--test-size", type=int, default=1000, help="rows after the training rows kept for testing")
+    parser.add_argument("--batch-size", type=int, default=1000, help="reviews per partial_fit mini-batch")
+    parser.add_argument("--workers", type=int, default=1, help="processes counting batches in parallel")
+    parser.add_argument("--load", metavar="MODEL", help="load a saved model instead of training")
+    parser.add_argument("--save", metavar="MODEL", help="save the trained model")
+    args = parser.parse_args(argv)
+
+    if args.load:
+        classifier = NaiveBayesSentimentClassifier.load(args.load)
+    else:
+        classifier = NaiveBayesSentimentClassifier()
+        batches = iter_imdb_batches(args.filename, args.batch_size, 0, args.train_size)
+        if args.workers > 1:
+            classifier.fit_parallel(batches, args.workers)
+        else:
+            classifier.fit_stream(batches)
+        if args.save:
+            classifier.save(args.save)
+    test_rows = list(iter_imdb_rows(args.filename, args.train_size, args.train_size + args.test_size))
+    test_docs = [review for review, _ in test_rows]
+    test_labels = [sentiment for _, sentiment in test_rows]
+
+    print(f"\nTrain: {classifier.total_docs} | Test: {len(test_docs)}")
     
-    train_docs, train_labels, test_docs, test_labels = load_imdb_data(
-        filename='IMDB Dataset.csv',
-        train_size=5000,
-        test_size=1000
-    )
-    
-    print(f"\nTrain: {len(train_docs)} | Test: {len(test_docs)}")
-    
-    train_counts = Counter(train_labels)
-    for sentiment, count in train_counts.items():
+    for sentiment, count in classifier.class_counts.items():
         print(f"  {colorize(sentiment, sentiment)}: {count}")
     
-    classifier = NaiveBayesSentimentClassifier()
-    classifier.train(train_docs, train_labels)
-    
     print("\nSample Predictions (10 random):")
     
     random_indices = sample(range(len(test_docs)), min(10, len(test_docs)))
@@ -113,7 +111,7 @@ def main():
     print("\nFinal Results:")
     
     accuracy = classifier.evaluate(test_docs, test_labels)
-    predictions = [classifier.predict(doc) for doc in test_docs]
+    predictions = classifier.predict_batch(test_docs)
     correct = sum(1 for p, t in zip(predictions, test_labels) if p == t)
     
     acc_color = Colors.GREEN if accuracy > 0.7 else Colors.RED
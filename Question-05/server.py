@@ -0,0 +1,283 @@
+"""
+Sentiment prediction server for a saved NaiveBayesSentimentClassifier
+
+An asyncio HTTP/1.1 server (TCP or Unix socket, keep-alive) that loads a model
+written by NaiveBayesSentimentClassifier.save() once and answers:
+
+    POST /predict   {"text": "..."}          -> {"label": ..., "scores": {...}}
+                    {"texts": ["...", ...]}  -> {"labels": [...]}
+    GET  /stats     request/batch counters, p50/p99 latency, throughput
+    GET  /health    {"status": "ok"}
+
+Requests are not scored one by one: a batcher task takes the first queued text,
+waits up to --max-delay-ms for more (or until --max-batch texts), and scores the
+whole micro-batch with one sparse matrix product (log_probabilities).
+
+--bench starts the server in-process and fires --requests requests from
+--concurrency keep-alive clients at it, so everything runs on localhost.
+
+Usage:
+    python main_imdb.py --save model.nb
+    python server.py model.nb [--host 127.0.0.1] [--port 8000] [--unix PATH]
+    python server.py model.nb --bench [--requests 5000] [--concurrency 64]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+
+import numpy as np
+
+from main import NaiveBayesSentimentClassifier
+
+STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+
+class MicroBatcher:
+    """Coalesces concurrent predict() calls into batches scored with one matrix product."""
+
+    def __init__(self, model, max_batch=64, max_delay=0.002, window=10000):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = asyncio.Queue()
+        self.latencies = deque(maxlen=window)  # seconds per request, most recent `window`
+        self.started = time.perf_counter()
+        self.requests = self.texts = self.batches = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, text):
+        """(label, {class: log probability}) for one text."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self._score(batch)
+
+    def _score(self, batch):
+        try:
+            scores = self.model.log_probabilities([text for text, _ in batch])
+        except Exception as error:  # a bad batch fails its requests, not the batcher
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        classes = self.model.classes
+        for (_, future), row in zip(batch, scores.tolist()):
+            if not future.done():
+                future.set_result((classes[int(np.argmax(row))], dict(zip(classes, row))))
+        self.batches += 1
+        self.texts += len(batch)
+
+    def stats(self):
+        latencies = np.array(self.latencies or [0.0]) * 1000
+        p50, p99 = np.percentile(latencies, [50, 99])
+        elapsed = time.perf_counter() - self.started
+        return {
+            'requests': self.requests,
+            'texts': self.texts,
+            'batches': self.batches,
+            'mean_batch': self.texts / self.batches if self.batches else 0.0,
+            'p50_ms': float(p50),
+            'p99_ms': float(p99),
+            'throughput_rps': self.requests / elapsed if elapsed else 0.0,
+            'uptime_s': elapsed,
+        }
+
+
+class SentimentServer:
+    """Minimal HTTP/1.1 front end over a MicroBatcher."""
+
+    def __init__(self, batcher):
+        self.batcher = batcher
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                start = time.perf_counter()
+                status, payload = await self.route(method, path, body)
+                if path == '/predict' and status == 200:
+                    self.batcher.requests += 1
+                    self.batcher.latencies.append(time.perf_counter() - start)
+                data = json.dumps(payload).encode('utf-8')
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(f"HTTP/1.1 {status} {STATUS[status]}\r\n"
+                             f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/stats':
+            return 200, self.batcher.stats()
+        if path != '/predict':
+            return 404, {'error': f"unknown path {path}"}
+        if method != 'POST':
+            return 405, {'error': "use POST"}
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError:
+            return 400, {'error': "body is not JSON"}
+        if not isinstance(request, dict):
+            request = {}
+        if isinstance(request.get('text'), str):
+            label, scores = await self.batcher.predict(request['text'])
+            return 200, {'label': label, 'scores': scores}
+        texts = request.get('texts')
+        if isinstance(texts, list) and all(isinstance(text, str) for text in texts):
+            results = await asyncio.gather(*(self.batcher.predict(text) for text in texts))
+            return 200, {'labels': [label for label, _ in results]}
+        return 400, {'error': 'expected {"text": str} or {"texts": [str, ...]}'}
+
+
+async def start_server(model, host='127.0.0.1', port=8000, unix=None, max_batch=64, max_delay=0.002):
+    """Start the batcher and the listening server; returns (server, batcher)."""
+    batcher = MicroBatcher(model, max_batch, max_delay)
+    batcher.start()
+    handler = SentimentServer(batcher).handle
+    if unix:
+        server = await asyncio.start_unix_server(handler, path=unix)
+    else:
+        server = await asyncio.start_server(handler, host, port)
+    return server, batcher
+
+
+async def _client(open_connection, texts, latencies):
+    reader, writer = await open_connection()
+    for text in texts:
+        body = json.dumps({'text': text}).encode('utf-8')
+        start = time.perf_counter()
+        writer.write(f"POST /predict HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+        await writer.drain()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            if line.lower().startswith(b'content-length:'):
+                length = int(line.split(b':')[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def load_test(model, texts, requests=5000, concurrency=64, unix=None, max_batch=64, max_delay=0.002):
+    """Serve the model on localhost and measure it from concurrent keep-alive clients."""
+    server, batcher = await start_server(model, port=0, unix=unix, max_batch=max_batch, max_delay=max_delay)
+    if unix:
+        open_connection = lambda: asyncio.open_unix_connection(unix)
+    else:
+        port = server.sockets[0].getsockname()[1]
+        open_connection = lambda: asyncio.open_connection('127.0.0.1', port)
+    latencies = []
+    per_client = [[texts[i % len(texts)] for i in range(c, requests, concurrency)] for c in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(open_connection, chunk, latencies) for chunk in per_client))
+    elapsed = time.perf_counter() - start
+    stats = batcher.stats()
+    server.close()
+    await server.wait_closed()
+    await batcher.stop()
+    p50, p99 = np.percentile(np.array(latencies) * 1000, [50, 99])
+    return {'requests': len(latencies), 'seconds': elapsed, 'throughput_rps': len(latencies) / elapsed,
+            'client_p50_ms': float(p50), 'client_p99_ms': float(p99), 'server': stats}
+
+
+async def serve(model, host, port, unix, max_batch, max_delay):
+    server, _ = await start_server(model, host, port, unix, max_batch, max_delay)
+    print(f"Serving on {unix or f'http://{host}:{port}'}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-batching sentiment prediction server")
+    parser.add_argument("model", help="model file written by NaiveBayesSentimentClassifier.save()")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--max-batch", type=int, default=64, help="largest micro-batch")
+    parser.add_argument("--max-delay-ms", type=float, default=2.0, help="longest wait for a micro-batch to fill")
+    parser.add_argument("--bench", action="store_true", help="run a localhost load test instead of serving")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--texts", default='test.csv', help="CSV with a text or review column for --bench")
+    args = parser.parse_args(argv)
+
+    model = NaiveBayesSentimentClassifier.load(args.model)
+    max_delay = args.max_delay_ms / 1000
+    if not args.bench:
+        asyncio.run(serve(model, args.host, args.port, args.unix, args.max_batch, max_delay))
+        return 0
+
+    texts = ["This is absolutely wonderful and amazing", "I hate everything about this terrible movie"]
+    if os.path.exists(args.texts):
+        with open(args.texts, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+            texts = [row.get('text') or row.get('review') or '' for row in csv.DictReader(f)] or texts
+    with tempfile.TemporaryDirectory() as directory:  # holds the benchmark socket unless --unix is given
+        listeners = [('tcp', None)]
+        if hasattr(asyncio, 'start_unix_server'):
+            listeners.append(('unix', args.unix or os.path.join(directory, 'sentiment.sock')))
+        for label, path in listeners:
+            result = asyncio.run(load_test(model, texts, args.requests, args.concurrency, path,
+                                           args.max_batch, max_delay))
+            server = result['server']
+            print(f"{label:<5} {result['requests']} requests, concurrency {args.concurrency}: "
+                  f"{result['throughput_rps']:.0f} req/s, client p50 {result['client_p50_ms']:.2f} ms, "
+                  f"p99 {result['client_p99_ms']:.2f} ms | server p50 {server['p50_ms']:.2f} ms, "
+                  f"p99 {server['p99_ms']:.2f} ms, mean batch {server['mean_batch']:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())